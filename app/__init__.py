@@ -1,8 +1,10 @@
 import os
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import DevelopmentConfig, TestingConfig, ProductionConfig
 from .extensions import register_extensions
 from .api import register_api_blueprint
+from .serializers import register_json_provider
 from flask_cors import CORS
 
 def create_app(config_object=None) -> Flask:
@@ -22,7 +24,12 @@ def create_app(config_object=None) -> Flask:
     if not app.config.get("SQLALCHEMY_DATABASE_URI"):
         raise RuntimeError("SQLALCHEMY_DATABASE_URI is not set")
 
+    if app.config.get("TRUSTED_PROXY_COUNT"):
+        # Rate limits are keyed on the client IP, not the proxy's.
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["TRUSTED_PROXY_COUNT"])
+
     register_extensions(app)
+    register_json_provider(app)
     register_api_blueprint(app)
     CORS(app)
 
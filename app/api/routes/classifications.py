@@ -1,21 +1,25 @@
 from flask import Blueprint, jsonify, request
 
-from app.extensions import db
+from app.extensions import cache, db
+from app.http_cache import conditional
 from app.models import MythicalClassification
 
 bp = Blueprint("classifications", __name__, url_prefix="/api/v1")
 
 
 @bp.route("/mythical-classifications", methods=["GET"])
+@conditional(tables=("mythical_classification",))
 def get_mythical_classifications():
     """Get all mythical classifications."""
-    classifications = MythicalClassification.query.all()
-    return jsonify(
-        [
+    classifications = cache.get_or_set(
+        "mythical-classifications",
+        lambda: [
             {"id": c.id, "name": c.name, "description": c.description}
-            for c in classifications
-        ]
+            for c in MythicalClassification.query.all()
+        ],
+        tables=("mythical_classification",),
     )
+    return jsonify(classifications)
 
 
 @bp.route("/mythical-classifications", methods=["POST"])
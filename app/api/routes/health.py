@@ -1,12 +1,15 @@
 from flask import Blueprint, jsonify
 from sqlalchemy import text
 
-from app.extensions import db
+from app.extensions import cache, compression, db, limiter, pokedex_index
+from app.http_cache import no_store
+from app.pool import pool_stats
 
 bp = Blueprint("health", __name__, url_prefix="/api/v1")
 
 
 @bp.route("/health")
+@no_store
 def health():
     """Health check endpoint with database connectivity verification."""
     try:
@@ -17,4 +20,12 @@ def health():
 
     status = "ok" if db_status == "connected" else "degraded"
 
-    return jsonify({"status": status, "database": db_status})
+    return jsonify({
+        "status": status,
+        "database": db_status,
+        "pool": pool_stats(db.engine),
+        "cache": cache.stats(),
+        "pokedex_index": pokedex_index.stats(),
+        "rate_limit": limiter.stats(),
+        "compression": compression.stats(),
+    })
@@ -0,0 +1,13 @@
+from flask import Blueprint
+
+from app.extensions import metrics
+from app.http_cache import no_store
+
+bp = Blueprint("metrics", __name__, url_prefix="/api/v1")
+
+
+@bp.route("/metrics")
+@no_store
+def get_metrics():
+    """Request latency, SQL and serialization metrics in Prometheus text format."""
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
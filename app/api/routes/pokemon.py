@@ -1,8 +1,50 @@
-from flask import Blueprint, jsonify, request
+import csv
+import io
+import json
+import random
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request, stream_with_context
+from sqlalchemy import or_, select
 
 from app.auth import require_api_key
-from app.extensions import db
-from app.models import Pokemon, Region, Type, MythicalClassification, MythicalPokemon
+from app.bulk import delete_pokemon_where, import_ndjson, insert_pokemon_batch
+from app.cache import POKEMON_TABLES
+from app.changes import InvalidToken, load_changes
+from app.extensions import cache, db, pokedex_index
+from app.http_cache import conditional, no_store
+from app.models import (
+    Pokemon,
+    PokemonTombstone,
+    Region,
+    Type,
+    MythicalClassification,
+    MythicalPokemon,
+)
+from app.pagination import InvalidCursor, get_per_page, keyset_page, offset_page
+from app.ratelimit import limit_concurrency
+from app.stats import PokemonFacts, facts_of, record_created, record_deleted
+from app.serializers import (
+    POKEMON_FIELDS,
+    InvalidFields,
+    parse_fields,
+    serialize_pokemon_rows,
+    trim_payload,
+)
+from app.queries import (
+    name_key,
+    name_key_in,
+    pokemon_name_in,
+    pokemon_query,
+    pokemon_rows_query,
+    pokemon_list_query,
+    pokemon_by_type_query,
+    pokemon_by_classification_query,
+    pokemon_search_filters,
+    pokemon_search_query,
+)
 
 bp = Blueprint("pokemon", __name__, url_prefix="/api/v1")
 
@@ -28,66 +70,432 @@ def serialize_pokemon(p):
     }
 
 
+@bp.errorhandler(InvalidFields)
+def invalid_fields(e):
+    return jsonify({"error": str(e)}), 400
+
+
+def requested_fields():
+    """Fields selected with ``?fields=``, or None for the full payload."""
+    return parse_fields(request.args.get("fields"))
+
+
+def cached_payload(loader):
+    """Read-through cache for the serialized payload of the current request."""
+    return cache.get_or_set(f"pokemon:{request.full_path}", loader, POKEMON_TABLES)
+
+
+def paginated_response(query, fields=None):
+    """
+    Serialize one page of a Pokémon list query built for `fields`.
+
+    Uses keyset pagination when a ``cursor`` argument is present and the
+    original ``?page=`` offset pagination otherwise.
+    """
+    per_page = get_per_page()
+
+    if "cursor" in request.args:
+        def load_cursor_page():
+            pokemon_list, next_cursor = keyset_page(
+                query, request.args["cursor"], per_page
+            )
+            return {
+                "data": serialize_pokemon_rows(pokemon_list, fields),
+                "next_cursor": next_cursor,
+            }
+
+        try:
+            return jsonify(cached_payload(load_cursor_page))
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+
+    page = request.args.get('page', 1, type=int)
+    return jsonify(cached_payload(
+        lambda: serialize_pokemon_rows(offset_page(query, page, per_page), fields)
+    ))
+
+
 @bp.route("/pokemon", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
 def get_all_pokemon():
     """Get all Pokémon."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    pokemon_list = Pokemon.query.order_by(Pokemon.pokedex_number.asc()).paginate(page=page, per_page=per_page, error_out=False).items
-    return jsonify([serialize_pokemon(p) for p in pokemon_list])
+    fields = requested_fields()
+    return paginated_response(pokemon_list_query(fields), fields)
 
 
 @bp.route("/pokemon/<int:pokedex_number>", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
 def get_pokemon_by_pokedex_number(pokedex_number: int):
     """Get a Pokémon by Pokedex number."""
-    pokemon = Pokemon.query.filter_by(pokedex_number=pokedex_number).first_or_404()
-    return jsonify(serialize_pokemon(pokemon))
+    fields = requested_fields()
+    if pokedex_index.enabled:
+        pokemon = pokedex_index.get_by_pokedex_number(pokedex_number)
+        if pokemon is None:
+            abort(404)
+        return jsonify(trim_payload(pokemon, fields))
+    return jsonify(cached_payload(
+        lambda: serialize_pokemon_rows([
+            pokemon_rows_query(fields)
+            .filter(Pokemon.pokedex_number == pokedex_number)
+            .first_or_404()
+        ], fields)[0]
+    ))
 
 
 @bp.route("/pokemon/name/<string:name>", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
 def get_pokemon_by_name(name: str):
     """Get a Pokémon by name."""
-    pokemon = Pokemon.query.filter_by(name=name).first_or_404()
-    return jsonify(serialize_pokemon(pokemon))
+    fields = requested_fields()
+    if pokedex_index.enabled:
+        pokemon = pokedex_index.get_by_name(name)
+        if pokemon is None:
+            abort(404)
+        return jsonify(trim_payload(pokemon, fields))
+    return jsonify(cached_payload(
+        lambda: serialize_pokemon_rows([
+            pokemon_rows_query(fields).filter(pokemon_name_in([name])).first_or_404()
+        ], fields)[0]
+    ))
+
+def batch_keys():
+    """
+    ``("dex", int)`` / ``("name", str)`` keys of a batch request, in request order.
+
+    Raises ValueError for a malformed Pokédex number.
+    """
+    keys = []
+    # request.args groups repeated parameters; parse the raw string to keep their order.
+    for param, values in parse_qsl(request.query_string.decode()):
+        if param not in ("dex", "name"):
+            continue
+        for value in values.split(","):
+            value = value.strip()
+            if not value:
+                continue
+            if param == "dex":
+                if not value.isdecimal():
+                    raise ValueError(f"Invalid Pokédex number: {value}")
+                value = int(value)
+            keys.append((param, value))
+    return keys
+
+
+def load_batch(keys, fields):
+    """Resolve batch keys to payloads (None when not found), with one query."""
+    numbers = {value for param, value in keys if param == "dex"}
+    names = {value for param, value in keys if param == "name"}
+
+    if pokedex_index.enabled:
+        found = {
+            **{("dex", n): pokedex_index.get_by_pokedex_number(n) for n in numbers},
+            **{("name", n): pokedex_index.get_by_name(n) for n in names},
+        }
+        return [
+            {key[0]: key[1], "pokemon": trim_payload(found[key], fields) if found[key] else None}
+            for key in keys
+        ]
+
+    # Always select name and dex number so rows can be matched back to keys.
+    query_fields = fields and tuple(
+        f for f in POKEMON_FIELDS if f in fields or f in ("name", "pokedex_number")
+    )
+    rows = (
+        pokemon_rows_query(query_fields)
+        .filter(or_(Pokemon.pokedex_number.in_(numbers), pokemon_name_in(names)))
+        .all()
+    )
+    found = {}
+    for row, payload in zip(rows, serialize_pokemon_rows(rows, query_fields)):
+        payload = trim_payload(payload, fields)
+        found.setdefault(("dex", row.pokedex_number), payload)
+        found.setdefault(("name", name_key(row.name)), payload)
+    return [
+        {key[0]: key[1], "pokemon": found.get(("name", name_key(key[1])) if key[0] == "name" else key)}
+        for key in keys
+    ]
+
+
+@bp.route("/pokemon/batch", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
+def get_pokemon_batch():
+    """
+    Get many Pokémon by Pokédex number and/or name in one request.
+
+    ``?dex=144,145&name=Mew`` (each repeatable or comma-separated) returns
+    one entry per key in request order; ``pokemon`` is null for keys that
+    match nothing. At most BATCH_MAX_KEYS keys are accepted.
+    """
+    fields = requested_fields()
+    try:
+        keys = batch_keys()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not keys:
+        return jsonify({"error": "Provide at least one dex or name"}), 400
+    maximum = current_app.config["BATCH_MAX_KEYS"]
+    if len(keys) > maximum:
+        return jsonify({"error": f"At most {maximum} keys per request"}), 400
+
+    return jsonify(cached_payload(lambda: load_batch(keys, fields)))
+
+
+@bp.route("/pokemon/changes", methods=["GET"])
+@no_store
+@limit_concurrency("changes")
+def get_pokemon_changes():
+    """
+    Pokémon inserted, updated or deleted since ``?since=TOKEN``.
+
+    Omit the token for a full sync. Each response carries the
+    ``next_token`` to send next; ``has_more`` means another page is
+    already waiting. ``?limit=`` caps the rows per stream at CHANGES_LIMIT.
+    """
+    fields = requested_fields()
+    maximum = current_app.config["CHANGES_LIMIT"]
+    limit = max(1, min(request.args.get("limit", maximum, type=int), maximum))
+    try:
+        return jsonify(load_changes(request.args.get("since"), limit, fields))
+    except InvalidToken as e:
+        return jsonify({"error": str(e)}), 400
+
+
+class CandidateIds:
+    """
+    Per-process id lists for random picks, one per filter combination.
+
+    Lists are rebuilt when the cache epoch or the Pokémon table versions
+    change (like `app.pokedex_index.PokedexIndex`), independently of the
+    read-through cache: picking stays one primary-key lookup when caching is
+    disabled, and never parses a shared cache file holding every id.
+    """
+
+    MAX_LISTS = 64
+
+    def __init__(self):
+        self._lists = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, filters):
+        """Ids of the Pokémon matching `filters`, in id order."""
+        key = json.dumps(filters, sort_keys=True)
+        version = (cache.epoch(), cache.versions(POKEMON_TABLES))
+        with self._lock:
+            entry = self._lists.get(key)
+            if entry is not None and entry[0] == version:
+                self._lists.move_to_end(key)
+                return entry[1]
+        ids = list(db.session.scalars(
+            select(Pokemon.id)
+            .where(*pokemon_search_filters(**filters))
+            .order_by(Pokemon.id)
+        ))
+        with self._lock:
+            self._lists[key] = (version, ids)
+            self._lists.move_to_end(key)
+            while len(self._lists) > self.MAX_LISTS:
+                self._lists.popitem(last=False)
+        return ids
+
+
+random_candidate_ids = CandidateIds()
+
 
 @bp.route("/pokemon/random", methods=["GET"])
+@no_store
+@limit_concurrency("random")
 def get_random_pokemon():
-    """Get a random Pokémon."""
-    pokemon = Pokemon.query.order_by(db.func.random()).first()
-    if not pokemon:
+    """
+    Get a random Pokémon, or a list of ``?count=N`` distinct ones.
+
+    Accepts the type, region and classification filters of the search
+    endpoint. Candidates are sampled from an in-memory id list, so a call
+    costs one primary-key lookup instead of a full scan and sort.
+    """
+    count = request.args.get("count", type=int)
+    if "count" in request.args and (count is None or count < 1):
+        return jsonify({"error": "count must be a positive integer"}), 400
+    fields = requested_fields()
+
+    ids = random_candidate_ids.get(reference_filters_from_args())
+    sample = random.sample(
+        ids, min(count or 1, current_app.config["RANDOM_MAX_COUNT"], len(ids))
+    )
+    rows = pokemon_rows_query(fields).filter(Pokemon.id.in_(sample)).all()
+    found = {row.id: p for row, p in zip(rows, serialize_pokemon_rows(rows, fields))}
+    pokemon_list = [found[i] for i in sample if i in found]
+
+    if not pokemon_list:
         return jsonify({"error": "No pokemon found"}), 404
-    return jsonify(serialize_pokemon(pokemon))
+    if count is None:
+        return jsonify(pokemon_list[0])
+    return jsonify(pokemon_list)
 
 @bp.route("/pokemon/type/<string:type_name>", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
 def get_pokemon_by_type(type_name: str):
     """Get all Pokémon by type name."""
-    type_obj = Type.query.filter_by(name=type_name).first_or_404()
-    pokemon_list = (
-        Pokemon.query
-        .join(Pokemon.types)
-        .filter(Type.id == type_obj.id)
-        .order_by(Pokemon.pokedex_number.asc())
-        .all()
-    )
-    return jsonify([serialize_pokemon(p) for p in pokemon_list])
+    fields = requested_fields()
+    if pokedex_index.enabled:
+        pokemon_list = pokedex_index.list_by_type(type_name)
+        if pokemon_list is None:
+            abort(404)
+        return jsonify([trim_payload(p, fields) for p in pokemon_list])
+
+    def load_pokemon_by_type():
+        type_obj = Type.query.filter(name_key_in(Type.name, [type_name])).first_or_404()
+        pokemon_list = pokemon_by_type_query(type_obj.id, fields).all()
+        return serialize_pokemon_rows(pokemon_list, fields)
+
+    return jsonify(cached_payload(load_pokemon_by_type))
 
 @bp.route("/pokemon/legendary", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
 def get_legendary_pokemon():
     """Get all Pokémon with classification_id=1 (legendary)."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    legendary_mythicals = MythicalPokemon.query.filter_by(classification_id=1).paginate(page=page, per_page=per_page, error_out=False).items
-    pokemon_list = [serialize_pokemon(m.pokemon) for m in legendary_mythicals if m.pokemon]
-    return jsonify(pokemon_list)
+    fields = requested_fields()
+    return paginated_response(pokemon_by_classification_query(1, fields), fields)
 
 @bp.route("/pokemon/singular", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
 def get_singular_pokemon():
     """Get all Pokémon with classification_id=2 (singular)."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    singular_mythicals = MythicalPokemon.query.filter_by(classification_id=2).paginate(page=page, per_page=per_page, error_out=False).items
-    pokemon_list = [serialize_pokemon(m.pokemon) for m in singular_mythicals if m.pokemon]
-    return jsonify(pokemon_list)
+    fields = requested_fields()
+    return paginated_response(pokemon_by_classification_query(2, fields), fields)
+
+def _id_or_name(value):
+    return int(value) if value.isdecimal() else value
+
+
+def reference_filters_from_args():
+    """Read the type/region/classification filters shared by search and random."""
+    region = request.args.get("region")
+    classification = request.args.get("classification")
+    return {
+        "types": [
+            _id_or_name(value.strip())
+            for arg in request.args.getlist("type")
+            for value in arg.split(",")
+            if value.strip()
+        ],
+        "region": _id_or_name(region) if region else None,
+        "classification": _id_or_name(classification) if classification else None,
+    }
+
+
+@bp.route("/pokemon/search", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
+@limit_concurrency("search")
+def search_pokemon():
+    """
+    Search Pokémon by any combination of filters.
+
+    Query parameters (all optional, combined with AND):
+    type (repeatable or comma-separated, id or name), region (id or name),
+    classification (id or name), dex_min, dex_max, name (prefix).
+    Supports the same pagination and ``fields`` parameters as the list endpoints.
+    """
+    fields = requested_fields()
+    dex_range = {}
+    for param in ("dex_min", "dex_max"):
+        if param in request.args:
+            value = request.args.get(param, type=int)
+            if value is None:
+                return jsonify({"error": f"{param} must be an integer"}), 400
+            dex_range[param] = value
+
+    query = pokemon_search_query(
+        fields,
+        name_prefix=request.args.get("name"),
+        **reference_filters_from_args(),
+        **dex_range,
+    )
+    return paginated_response(query, fields)
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Payload field -> (CSV column, cell value), flattening the nested sub-objects.
+CSV_COLUMNS = {
+    "id": ("id", lambda data: data["id"]),
+    "name": ("name", lambda data: data["name"]),
+    "pokedex_number": ("pokedex_number", lambda data: data["pokedex_number"]),
+    "image_url": ("image_url", lambda data: data["image_url"]),
+    "description": ("description", lambda data: data["description"]),
+    "region": ("region", lambda data: data["region"]["name"]),
+    "types": ("types", lambda data: "/".join(t["name"] for t in data["types"])),
+    "mythical_info": (
+        "classification",
+        lambda data: data["mythical_info"]["classification"] if data["mythical_info"] else "",
+    ),
+    "created_at": ("created_at", lambda data: data["created_at"]),
+}
+
+
+def iter_all_pokemon(batch_size, fields=None):
+    """
+    Yield every serialized Pokémon in Pokédex order, one keyset batch at a time.
+
+    Each batch is a separate query, so only `batch_size` rows are held in
+    memory and no connection is pinned for the whole stream.
+    """
+    cursor = None
+    while True:
+        batch, cursor = keyset_page(pokemon_list_query(fields), cursor, batch_size)
+        yield from serialize_pokemon_rows(batch, fields)
+        if cursor is None:
+            return
+
+
+def export_rows(export_format, fields=None):
+    """Yield the dataset as NDJSON lines or CSV rows, batch by batch."""
+    pokemon_iter = iter_all_pokemon(current_app.config["EXPORT_BATCH_SIZE"], fields)
+
+    if export_format == "ndjson":
+        for data in pokemon_iter:
+            yield current_app.json.dumps(data) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush_row(row):
+        writer.writerow(row)
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    columns = [CSV_COLUMNS[f] for f in fields or CSV_COLUMNS]
+    yield flush_row([header for header, _ in columns])
+    for data in pokemon_iter:
+        yield flush_row([cell(data) for _, cell in columns])
+
+
+@bp.route("/pokemon/export", methods=["GET"])
+@conditional(tables=POKEMON_TABLES)
+@limit_concurrency("export")
+def export_pokemon():
+    """
+    Stream every Pokémon as NDJSON (default) or CSV.
+
+    Rows are read in keyset batches of EXPORT_BATCH_SIZE, so memory stays
+    flat and the first bytes are sent before the last batch is queried.
+    ``?fields=`` limits the exported fields (and CSV columns).
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {list(EXPORT_FORMATS)}"}), 400
+    fields = requested_fields()
+
+    return Response(
+        stream_with_context(export_rows(export_format, fields)),
+        mimetype=EXPORT_FORMATS[export_format],
+    )
+
 
 def create_single_pokemon(data):
     """Helper to create a single Pokemon. Returns (pokemon, error)."""
@@ -104,11 +512,14 @@ def create_single_pokemon(data):
     if len(data["type_ids"]) < 1:
         return None, "A Pokémon must have at least 1 type"
 
-    # Check if already exists
-    if Pokemon.query.filter_by(name=data["name"]).first():
+    # Check if already exists (name or number, in one query)
+    existing = Pokemon.query.filter(
+        or_(Pokemon.name == data["name"], Pokemon.pokedex_number == data["pokedex_number"])
+    ).all()
+    if any(p.name == data["name"] for p in existing):
         return None, f"Pokemon \"{data['name']}\" already exists"
 
-    if Pokemon.query.filter_by(pokedex_number=data["pokedex_number"]).first():
+    if any(p.pokedex_number == data["pokedex_number"] for p in existing):
         return None, f"Pokemon with Pokedex #{data['pokedex_number']} already exists"
 
     # Verify region exists
@@ -148,6 +559,12 @@ def create_single_pokemon(data):
         )
         db.session.add(mythical_info)
 
+    record_created([PokemonFacts(
+        pokemon.pokedex_number,
+        pokemon.region_id,
+        [t.id for t in types],
+        (data.get("mythical") or {}).get("classification_id"),
+    )])
     return pokemon, None
 
 
@@ -162,18 +579,9 @@ def create_pokemon():
     """
     data = request.get_json()
 
-    # Si es una lista, crear múltiples
+    # Si es una lista, crear múltiples con inserciones en bloque
     if isinstance(data, list):
-        created = []
-        errors = []
-
-        for poke_data in data:
-            pokemon, error = create_single_pokemon(poke_data)
-            if error:
-                errors.append(f"{poke_data.get('name', 'unknown')}: {error}")
-            else:
-                created.append(poke_data["name"])
-
+        created, errors = insert_pokemon_batch(data)
         db.session.commit()
 
         return jsonify({
@@ -188,21 +596,132 @@ def create_pokemon():
         db.session.rollback()
         return jsonify({"error": error}), 400
 
+    pokemon_id = pokemon.id
     db.session.commit()
+    # Reload with its relationships eager loaded rather than lazily one by one.
+    pokemon = pokemon_query().filter(Pokemon.id == pokemon_id).one()
     return jsonify(serialize_pokemon(pokemon)), 201
 
 
+@bp.route("/pokemon/import", methods=["POST"])
+@require_api_key
+@limit_concurrency("import")
+def import_pokemon():
+    """
+    Import Pokémon from an NDJSON request body, one object per line.
+
+    Lines are validated and inserted in chunks of ``?chunk_size=`` (default
+    IMPORT_CHUNK_SIZE), each committed separately. The response streams one
+    NDJSON progress report per chunk followed by a summary line.
+    """
+    maximum = current_app.config["IMPORT_MAX_CHUNK_SIZE"]
+    chunk_size = request.args.get(
+        "chunk_size", current_app.config["IMPORT_CHUNK_SIZE"], type=int
+    )
+    chunk_size = max(1, min(chunk_size, maximum))
+
+    def generate():
+        for progress in import_ndjson(request.stream, chunk_size):
+            yield json.dumps(progress, ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
+
+
 @bp.route("/pokemon/<int:pokemon_id>", methods=["DELETE"])
 @require_api_key
 def delete_pokemon(pokemon_id: int):
     """Delete a Pokémon."""
-    pokemon = Pokemon.query.get_or_404(pokemon_id)
+    pokemon = pokemon_query().filter(Pokemon.id == pokemon_id).first_or_404()
+    facts = facts_of(pokemon)
 
     # Delete mythical info first if exists
     if pokemon.mythical_info:
         db.session.delete(pokemon.mythical_info)
 
     db.session.delete(pokemon)
+    db.session.add(PokemonTombstone(
+        pokemon_id=pokemon.id, pokedex_number=pokemon.pokedex_number, name=pokemon.name
+    ))
+    # Flush first so the region's Pokédex range is re-read without this Pokémon.
+    db.session.flush()
+    record_deleted([facts])
     db.session.commit()
 
     return jsonify({"message": f"Pokemon {pokemon.name} deleted"}), 200
+
+
+# Filters accepted by bulk delete -> keyword of `pokemon_search_filters`.
+BULK_DELETE_FILTERS = {
+    "type": "types",
+    "region": "region",
+    "classification": "classification",
+    "dex_min": "dex_min",
+    "dex_max": "dex_max",
+    "name": "name_prefix",
+}
+
+
+def bulk_delete_criteria(data):
+    """
+    SQL criteria for a bulk delete body, combined with AND.
+
+    Raises ValueError when the body selects nothing or is malformed.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Body must be a JSON object")
+
+    criteria = []
+    for key, column in (("ids", Pokemon.id), ("pokedex_numbers", Pokemon.pokedex_number)):
+        if key in data:
+            values = data[key]
+            if not isinstance(values, list) or not all(isinstance(v, int) for v in values):
+                raise ValueError(f"{key} must be a list of integers")
+            criteria.append(column.in_(values))
+
+    filters = data.get("filter")
+    if filters is not None:
+        if not isinstance(filters, dict) or not filters:
+            raise ValueError("filter must be a non-empty object")
+        unknown = sorted(set(filters) - set(BULK_DELETE_FILTERS))
+        if unknown:
+            raise ValueError(f"Unknown filters: {unknown}")
+        kwargs = {BULK_DELETE_FILTERS[k]: v for k, v in filters.items()}
+        if "types" in kwargs and not isinstance(kwargs["types"], list):
+            kwargs["types"] = [kwargs["types"]]
+        for key in ("dex_min", "dex_max"):
+            if key in kwargs and not isinstance(kwargs[key], int):
+                raise ValueError(f"{key} must be an integer")
+        if "name_prefix" in kwargs and not isinstance(kwargs["name_prefix"], str):
+            raise ValueError("name must be a string")
+        references = kwargs.get("types", []) + [kwargs.get("region"), kwargs.get("classification")]
+        if not all(isinstance(v, (int, str)) for v in references if v is not None):
+            raise ValueError("type, region and classification must be ids or names")
+        criteria += pokemon_search_filters(**kwargs)
+
+    if not criteria:
+        raise ValueError("Provide ids, pokedex_numbers or filter")
+    return criteria
+
+
+@bp.route("/pokemon/bulk-delete", methods=["POST"])
+@require_api_key
+@limit_concurrency("bulk_delete")
+def bulk_delete_pokemon():
+    """
+    Delete every Pokémon matching the body in one transaction.
+
+    Body (keys combined with AND): ``ids`` and/or ``pokedex_numbers``
+    (lists of integers) and/or ``filter`` (the `/pokemon/search` filters:
+    type, region, classification, dex_min, dex_max, name prefix).
+    Responds with the number of rows deleted per table.
+    """
+    try:
+        criteria = bulk_delete_criteria(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    deleted = delete_pokemon_where(criteria, current_app.config["BULK_DELETE_CHUNK_SIZE"])
+    db.session.commit()
+    return jsonify({"deleted": deleted}), 200
@@ -1,17 +1,23 @@
 from flask import Blueprint, jsonify, request
 
 from app.auth import require_api_key
-from app.extensions import db
+from app.extensions import cache, db
+from app.http_cache import conditional
 from app.models import Region
 
 bp = Blueprint("regions", __name__, url_prefix="/api/v1")
 
 
 @bp.route("/regions", methods=["GET"])
+@conditional(tables=("region",))
 def get_regions():
     """Get all regions."""
-    regions = Region.query.all()
-    return jsonify([{"id": r.id, "name": r.name} for r in regions])
+    regions = cache.get_or_set(
+        "regions",
+        lambda: [{"id": r.id, "name": r.name} for r in Region.query.all()],
+        tables=("region",),
+    )
+    return jsonify(regions)
 
 
 @bp.route("/regions", methods=["POST"])
@@ -0,0 +1,55 @@
+import time
+
+import click
+from flask import Blueprint, current_app, jsonify, request
+
+from app.auth import require_api_key
+from app.ratelimit import limit_concurrency
+from app.seed import seed_database
+
+# cli_group=None puts the command at the top level: ``flask seed``.
+bp = Blueprint("seed", __name__, url_prefix="/api/v1", cli_group=None)
+
+
+@bp.route("/seed", methods=["POST"])
+@require_api_key
+@limit_concurrency("seed")
+def seed():
+    """
+    Replace all data with the canonical dataset.
+
+    An optional JSON body ``{"synthetic": N, "random_seed": S}`` adds N
+    generated Pokémon (at most SEED_MAX_SYNTHETIC); the same seed always
+    produces the same rows.
+    """
+    data = request.get_json(silent=True) or {}
+    synthetic = data.get("synthetic", 0)
+    random_seed = data.get("random_seed", 0)
+    maximum = current_app.config["SEED_MAX_SYNTHETIC"]
+    if not isinstance(synthetic, int) or not 0 <= synthetic <= maximum:
+        return jsonify({"error": f"synthetic must be an integer between 0 and {maximum}"}), 400
+    if not isinstance(random_seed, int):
+        return jsonify({"error": "random_seed must be an integer"}), 400
+
+    started = time.perf_counter()
+    counts = seed_database(synthetic, random_seed, current_app.config["SEED_BATCH_SIZE"])
+    return jsonify({
+        "message": "Database seeded",
+        "rows": counts,
+        "seconds": round(time.perf_counter() - started, 3),
+    }), 201
+
+
+@bp.cli.command("seed")
+@click.option("--synthetic", default=0, show_default=True, help="Generated Pokémon to add.")
+@click.option("--random-seed", default=0, show_default=True, help="Seed of the generator.")
+@click.option("--batch-size", type=int, help="Rows per insert statement (default: SEED_BATCH_SIZE).")
+def seed_command(synthetic, random_seed, batch_size):
+    """Replace all data with the canonical dataset plus synthetic Pokémon."""
+    started = time.perf_counter()
+    counts = seed_database(
+        synthetic, random_seed, batch_size or current_app.config["SEED_BATCH_SIZE"]
+    )
+    for table, count in counts.items():
+        click.echo(f"{table:24} {count:>9}")
+    click.echo(f"seeded in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,36 @@
+import time
+
+import click
+from flask import Blueprint, jsonify
+
+from app.extensions import cache, db
+from app.http_cache import conditional
+from app.stats import STATS_TABLES, load_stats, rebuild_stats
+
+# CLI commands are grouped under the blueprint: ``flask stats rebuild``.
+bp = Blueprint("stats", __name__, url_prefix="/api/v1")
+
+
+@bp.route("/stats", methods=["GET"])
+@conditional(tables=STATS_TABLES)
+def get_stats():
+    """
+    Pokémon counts per region, type, classification and type combination.
+
+    Served from the ``pokemon_stat`` summary, which every write keeps up to
+    date, so the cost does not grow with the number of Pokémon.
+    """
+    return jsonify(cache.get_or_set("stats", load_stats, tables=STATS_TABLES))
+
+
+@bp.cli.command("rebuild")
+def rebuild_command():
+    """Recompute the statistics summary from the Pokémon tables."""
+    started = time.perf_counter()
+    try:
+        rows = rebuild_stats()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    click.echo(f"rebuilt {rows} summary rows in {time.perf_counter() - started:.2f}s")
@@ -1,17 +1,23 @@
 from flask import Blueprint, jsonify, request
 
 from app.auth import require_api_key
-from app.extensions import db
+from app.extensions import cache, db
+from app.http_cache import conditional
 from app.models import Type
 
 bp = Blueprint("types", __name__, url_prefix="/api/v1")
 
 
 @bp.route("/types", methods=["GET"])
+@conditional(tables=("type",))
 def get_types():
     """Get all Pokémon types."""
-    types = Type.query.all()
-    return jsonify([{"id": t.id, "name": t.name} for t in types])
+    types = cache.get_or_set(
+        "types",
+        lambda: [{"id": t.id, "name": t.name} for t in Type.query.all()],
+        tables=("type",),
+    )
+    return jsonify(types)
 
 
 @bp.route("/types", methods=["POST"])
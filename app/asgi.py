@@ -0,0 +1,298 @@
+"""
+Asyncio (ASGI) serving mode.
+
+`create_asgi_app` wraps the Flask app in an ASGI application. The hot read
+endpoints - the Pokémon list and the lookups by Pokédex number and name -
+are answered on the event loop through SQLAlchemy's async engine, reusing
+the query builders, serializers, read-through cache, ETags and compression
+of the Flask routes, so a process keeps many slow clients in flight
+without a thread each. Every other request, and any request the async path cannot answer
+(unknown Pokémon, invalid parameters), is handed to the Flask app on a
+thread pool through asgiref's WSGI adapter, so responses are identical in
+both modes.
+
+The async engine connects to ``ASYNC_DATABASE_URL``, or to
+``SQLALCHEMY_DATABASE_URI`` with its driver swapped for an async one
+(aiomysql for MySQL, aiosqlite for SQLite). Natively served requests are
+not reported by `app.instrumentation` and always read from the primary;
+they are rate limited like the Flask routes (see `app.ratelimit`) and get
+their CORS headers from the app's own flask-cors hook.
+
+Requires the ``asgi`` extra: ``uvicorn asgi:app``.
+"""
+import math
+import re
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import Response
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from .cache import POKEMON_TABLES
+from .extensions import cache, compression, limiter
+from .http_cache import compute_etag
+from .models import Pokemon
+from .pagination import InvalidCursor, keyset_query, split_keyset_page
+from .queries import pokemon_list_query, pokemon_name_in, pokemon_rows_query
+from .ratelimit import client_identity
+from .serializers import InvalidFields, build_payloads, group_types, needs_types, parse_fields, types_statement
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(config):
+    """Database URL for the async engine."""
+    url = make_url(config.get("ASYNC_DATABASE_URL") or config["SQLALCHEMY_DATABASE_URI"])
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+def async_engine_options(config):
+    """The sync engine options that also apply to an async engine."""
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    options.pop("poolclass", None)  # the async engine needs an async-adapted pool
+    return options
+
+
+class NotServed(Exception):
+    """Raised by a native handler to hand the request over to Flask."""
+
+
+class AsyncRequest:
+    """The parts of an ASGI HTTP scope the native handlers read."""
+
+    def __init__(self, scope, trusted_proxies=0):
+        self.path = scope["path"]
+        self.query_string = scope["query_string"].decode("utf-8", "replace")
+        self.args = {}
+        for key, value in parse_qsl(self.query_string, keep_blank_values=True):
+            self.args.setdefault(key, value)  # first value wins, like request.args.get
+        self.headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        self.remote_addr = (scope.get("client") or (None,))[0]
+        if trusted_proxies:
+            # Same rule as werkzeug's ProxyFix(x_for=trusted_proxies) on the Flask side.
+            forwarded = [
+                value.strip() for value in self.headers.get("x-forwarded-for", "").split(",")
+            ]
+            if len(forwarded) >= trusted_proxies and forwarded[-trusted_proxies]:
+                self.remote_addr = forwarded[-trusted_proxies]
+
+    @property
+    def full_path(self):
+        """Same format as Flask's ``request.full_path``, so cache keys and ETags match."""
+        return f"{self.path}?{self.query_string}"
+
+
+class AsyncPokedexApp:
+    """ASGI application serving hot reads natively and everything else through Flask."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.config = flask_app.config
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.engine = create_async_engine(
+            async_database_url(self.config), **async_engine_options(self.config)
+        )
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        # flask-cors' after_request hook, applied to native responses as well.
+        self.cors = next(
+            (
+                hook
+                for hook in flask_app.after_request_funcs.get(None, ())
+                if hook.__name__ == "cors_after_request"
+            ),
+            None,
+        )
+
+        self.routes = [(re.compile(r"/api/v1/pokemon"), self.list_pokemon)]
+        # Lookups answered from the in-memory index are already cheap; leave them to Flask.
+        if not self.config.get("POKEDEX_INDEX_ENABLED"):
+            self.routes += [
+                (re.compile(r"/api/v1/pokemon/(\d+)"), self.pokemon_by_pokedex_number),
+                (re.compile(r"/api/v1/pokemon/name/([^/]+)"), self.pokemon_by_name),
+            ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, handler in self.routes:
+                match = pattern.fullmatch(scope["path"])
+                if match:
+                    try:
+                        return await self._serve(handler, AsyncRequest(scope, self.config.get("TRUSTED_PROXY_COUNT", 0)), match.groups(), send)
+                    except NotServed:
+                        break
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _serve(self, handler, request, args, send):
+        """Run a handler under the same rate limit, cache, ETag and Cache-Control rules as Flask."""
+        # A request handed over to Flask afterwards is charged a second token.
+        retry_after = limiter.hit(
+            "pokemon", client_identity(request.headers.get("x-api-key"), request.remote_addr)
+        )
+        if retry_after:
+            body = b'{"error":"Too many requests"}\n'
+            await send({"type": "http.response.start", "status": 429, "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                *self._cors_headers(request, vary=()),
+            ]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = compute_etag(POKEMON_TABLES, request.full_path)
+        headers = [
+            (b"cache-control", f"public, max-age={self._max_age()}".encode()),
+            *self._cors_headers(request, vary=("Accept-Encoding",)),
+        ]
+        matched = compression.matching_etag(request.headers.get("if-none-match"), etag)
+        if matched:
+            headers.append((b"etag", f'"{matched}"'.encode()))
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        encoding = compression.negotiate(request.headers.get("accept-encoding"))
+        cached = compression.cached(etag, encoding)
+        if cached:
+            body = cached[1]
+        else:
+            payload = await handler(request, *args)
+            body, encoding = compression.encode(
+                (self.flask_app.json.dumps(payload) + "\n").encode(), "application/json", encoding, etag
+            )
+        headers += [
+            (b"etag", f'"{compression.tag(etag, encoding)}"'.encode()),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _cors_headers(self, request, vary):
+        """The CORS and ``Vary`` headers Flask would add to this request's response."""
+        response = Response()
+        if self.cors is not None:
+            with self.flask_app.test_request_context(
+                request.path, method="GET", headers=request.headers
+            ):
+                response = self.cors(response)
+        for value in vary:
+            response.vary.add(value)
+        return [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in response.headers.items()
+            if name.lower().startswith("access-control-") or name.lower() == "vary"
+        ]
+
+    def _max_age(self):
+        return self.config.get("CACHE_CONTROL_MAX_AGE", {}).get(
+            "pokemon", self.config.get("CACHE_CONTROL_DEFAULT_MAX_AGE", 60)
+        )
+
+    def _statement(self, build):
+        """Build a Select with the sync query builders, which need an app context."""
+        try:
+            with self.flask_app.app_context():
+                return build().statement
+        except (InvalidFields, InvalidCursor):
+            raise NotServed
+
+    async def _fetch(self, statement, fields):
+        """Rows of a `pokemon_rows_query` statement and their types, over the async engine."""
+        async with self.session_factory() as session:
+            rows = (await session.execute(statement)).all()
+            types = {}
+            if rows and needs_types(fields):
+                types = group_types(await session.execute(types_statement([r[0] for r in rows])))
+        return rows, types
+
+    def _cached(self, request, loader):
+        return cache.aget_or_set(f"pokemon:{request.full_path}", loader, POKEMON_TABLES)
+
+    def _fields(self, request):
+        try:
+            return parse_fields(request.args.get("fields"))
+        except InvalidFields:
+            raise NotServed
+
+    def _per_page(self, request):
+        try:
+            per_page = int(request.args.get("per_page", self.config["POKEMON_PER_PAGE"]))
+        except ValueError:
+            per_page = self.config["POKEMON_PER_PAGE"]
+        return max(1, min(per_page, self.config["POKEMON_MAX_PER_PAGE"]))
+
+    async def list_pokemon(self, request):
+        """Async twin of ``GET /api/v1/pokemon``."""
+        fields = self._fields(request)
+        per_page = self._per_page(request)
+
+        if "cursor" in request.args:
+            statement = self._statement(
+                lambda: keyset_query(pokemon_list_query(fields), request.args["cursor"], per_page)
+            )
+
+            async def load_cursor_page():
+                rows, types = await self._fetch(statement, fields)
+                items, next_cursor = split_keyset_page(rows, per_page)
+                return {"data": build_payloads(items, types, fields), "next_cursor": next_cursor}
+
+            return await self._cached(request, load_cursor_page)
+
+        try:
+            page = max(int(request.args.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+        statement = self._statement(
+            lambda: pokemon_list_query(fields).offset((page - 1) * per_page).limit(per_page)
+        )
+
+        async def load_page():
+            return build_payloads(*await self._fetch(statement, fields), fields)
+
+        return await self._cached(request, load_page)
+
+    async def _one(self, request, criterion):
+        fields = self._fields(request)
+        statement = self._statement(lambda: pokemon_rows_query(fields).filter(criterion).limit(1))
+
+        async def load():
+            rows, types = await self._fetch(statement, fields)
+            if not rows:
+                raise NotServed  # Flask renders the 404
+            return build_payloads(rows, types, fields)[0]
+
+        return await self._cached(request, load)
+
+    async def pokemon_by_pokedex_number(self, request, pokedex_number):
+        """Async twin of ``GET /api/v1/pokemon/<int:pokedex_number>``."""
+        return await self._one(request, Pokemon.pokedex_number == int(pokedex_number))
+
+    async def pokemon_by_name(self, request, name):
+        """Async twin of ``GET /api/v1/pokemon/name/<name>``."""
+        return await self._one(request, pokemon_name_in([name]))
+
+
+def create_asgi_app(flask_app):
+    """ASGI application serving `flask_app` in asyncio mode."""
+    return AsyncPokedexApp(flask_app)
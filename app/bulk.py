@@ -0,0 +1,288 @@
+"""
+Set-based bulk operations on Pokémon.
+
+These avoid per-row ORM work: a batch is validated in memory against one
+lookup query per referenced table and written with executemany inserts.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .extensions import db
+from .models import (
+    Pokemon,
+    PokemonTombstone,
+    Region,
+    Type,
+    MythicalClassification,
+    pokemon_type,
+    MythicalPokemon,
+)
+from .queries import name_key
+from .stats import PokemonFacts, pokemon_facts, record_created, record_deleted
+
+
+REQUIRED_FIELDS = ["name", "pokedex_number", "region_id", "type_ids"]
+
+
+def _existing(column, values):
+    """Return the subset of `values` present in `column`, in one query."""
+    values = {v for v in values if v is not None}
+    if not values:
+        return set()
+    return set(db.session.scalars(select(column).where(column.in_(values))))
+
+
+def _hashable(value):
+    return value if isinstance(value, (int, str)) else None
+
+
+def _validate(item, known, seen_names, seen_numbers):
+    """Validate one batch item. Returns an error message or None."""
+    if not isinstance(item, dict):
+        return "Invalid Pokémon object"
+
+    missing = [f for f in REQUIRED_FIELDS if f not in item]
+    if missing:
+        return f"Missing required fields: {missing}"
+
+    name = item["name"]
+    number = item["pokedex_number"]
+    if not isinstance(name, str):
+        return "name must be a string"
+    if not isinstance(number, int):
+        return "pokedex_number must be an integer"
+
+    type_ids = item["type_ids"]
+    if not isinstance(type_ids, list):
+        return "type_ids must be a list"
+    if len(type_ids) > Pokemon.MAX_TYPES:
+        return "A Pokémon can have at most 2 types"
+    if len(type_ids) < 1:
+        return "A Pokémon must have at least 1 type"
+
+    if name_key(name) in known["names"] or name_key(name) in seen_names:
+        return f"Pokemon \"{name}\" already exists"
+
+    if number in known["numbers"] or number in seen_numbers:
+        return f"Pokemon with Pokedex #{number} already exists"
+
+    if _hashable(item["region_id"]) not in known["regions"]:
+        return f"Region with id {item['region_id']} not found"
+
+    if len({_hashable(t) for t in type_ids} & known["types"]) != len(type_ids):
+        return "One or more type_ids not found"
+
+    mythical = item.get("mythical")
+    if mythical:
+        classification_id = mythical.get("classification_id") if isinstance(mythical, dict) else None
+        if _hashable(classification_id) not in known["classifications"]:
+            return "Mythical classification not found"
+
+    return None
+
+
+def insert_pokemon_batch(items):
+    """
+    Validate and insert a batch of Pokémon with set-based statements.
+
+    Returns ``(created_names, errors)`` in the same format as the per-item
+    path of ``POST /api/v1/pokemon``. Invalid items are skipped entirely.
+    The caller is responsible for committing.
+    """
+    dicts = [item for item in items if isinstance(item, dict)]
+    known = {
+        "names": {
+            name_key(name)
+            for name in _existing(Pokemon.name, (_hashable(i.get("name")) for i in dicts))
+        },
+        "numbers": _existing(
+            Pokemon.pokedex_number, (_hashable(i.get("pokedex_number")) for i in dicts)
+        ),
+        "regions": _existing(Region.id, (_hashable(i.get("region_id")) for i in dicts)),
+        "types": _existing(
+            Type.id,
+            (
+                _hashable(t)
+                for i in dicts
+                if isinstance(i.get("type_ids"), list)
+                for t in i["type_ids"]
+            ),
+        ),
+        "classifications": _existing(
+            MythicalClassification.id,
+            (
+                _hashable(i["mythical"].get("classification_id"))
+                for i in dicts
+                if isinstance(i.get("mythical"), dict)
+            ),
+        ),
+    }
+
+    valid = []
+    errors = []
+    seen_names = set()
+    seen_numbers = set()
+    for item in items:
+        error = _validate(item, known, seen_names, seen_numbers)
+        if error:
+            name = item.get("name", "unknown") if isinstance(item, dict) else "unknown"
+            errors.append(f"{name}: {error}")
+            continue
+        seen_names.add(name_key(item["name"]))
+        seen_numbers.add(item["pokedex_number"])
+        valid.append(item)
+
+    if not valid:
+        return [], errors
+
+    db.session.execute(
+        insert(Pokemon),
+        [
+            {
+                "name": item["name"],
+                "pokedex_number": item["pokedex_number"],
+                "description": item.get("description"),
+                "region_id": item["region_id"],
+            }
+            for item in valid
+        ],
+    )
+
+    ids = dict(
+        db.session.execute(
+            select(Pokemon.name, Pokemon.id).where(
+                Pokemon.name.in_([item["name"] for item in valid])
+            )
+        ).all()
+    )
+
+    db.session.execute(
+        insert(pokemon_type),
+        [
+            {"pokemon_id": ids[item["name"]], "type_id": type_id}
+            for item in valid
+            for type_id in item["type_ids"]
+        ],
+    )
+
+    mythical_rows = [
+        {
+            "pokemon_id": ids[item["name"]],
+            "classification_id": item["mythical"]["classification_id"],
+        }
+        for item in valid
+        if item.get("mythical")
+    ]
+    if mythical_rows:
+        db.session.execute(insert(MythicalPokemon), mythical_rows)
+
+    record_created(
+        PokemonFacts(
+            item["pokedex_number"],
+            item["region_id"],
+            item["type_ids"],
+            item["mythical"]["classification_id"] if item.get("mythical") else None,
+        )
+        for item in valid
+    )
+
+    return [item["name"] for item in valid], errors
+
+
+def delete_pokemon_where(criteria, chunk_size=5000):
+    """
+    Delete the Pokémon matching every criterion with set-based statements.
+
+    The matching ids are read with one query (plain integers, no ORM
+    objects). Then, per chunk of `chunk_size` ids, the Pokémon are
+    tombstoned for the change feed and their ``mythical_pokemon``,
+    ``pokemon_type`` and ``pokemon`` rows are removed with one DELETE each,
+    and the chunk is subtracted from the `app.stats` summary.
+    Resolving the ids first keeps type filters valid once the association
+    rows are gone, and sidesteps MySQL's refusal to delete from a table the
+    subquery reads. The caller is responsible for committing.
+
+    Returns the number of rows deleted per table.
+    """
+    ids = list(db.session.scalars(select(Pokemon.id).where(*criteria).order_by(Pokemon.id)))
+    counts = {"mythical_pokemon": 0, "pokemon_type": 0, "pokemon": 0}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        facts = pokemon_facts(chunk)
+        db.session.execute(
+            insert(PokemonTombstone).from_select(
+                ["pokemon_id", "pokedex_number", "name", "deleted_at"],
+                select(
+                    Pokemon.id, Pokemon.pokedex_number, Pokemon.name, literal(datetime.utcnow())
+                ).where(Pokemon.id.in_(chunk)),
+            )
+        )
+        for name, statement in (
+            ("mythical_pokemon", delete(MythicalPokemon).where(MythicalPokemon.pokemon_id.in_(chunk))),
+            ("pokemon_type", delete(pokemon_type).where(pokemon_type.c.pokemon_id.in_(chunk))),
+            ("pokemon", delete(Pokemon).where(Pokemon.id.in_(chunk))),
+        ):
+            result = db.session.execute(statement, execution_options={"synchronize_session": False})
+            counts[name] += result.rowcount
+        record_deleted(facts)
+    return counts
+
+
+def _import_chunk(chunk):
+    """Insert one chunk and commit it. Returns ``(created_names, errors)``."""
+    try:
+        created, errors = insert_pokemon_batch(chunk)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return [], [f"chunk rolled back: {e.__class__.__name__}"]
+    return created, errors
+
+
+def _read_chunks(lines, chunk_size):
+    """Group NDJSON lines into ``(first_line, last_line, objects, parse_errors)`` chunks."""
+    objects, parse_errors, first_line = [], [], 1
+    line_number = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line:
+            try:
+                objects.append(json.loads(line))
+            except ValueError:
+                parse_errors.append(f"line {line_number}: invalid JSON")
+        if len(objects) >= chunk_size:
+            yield first_line, line_number, objects, parse_errors
+            objects, parse_errors, first_line = [], [], line_number + 1
+
+    if objects or parse_errors:
+        yield first_line, line_number, objects, parse_errors
+
+
+def import_ndjson(lines, chunk_size):
+    """
+    Import Pokémon from an iterable of NDJSON lines, committing per chunk.
+
+    Yields one progress report per chunk, then a final summary. Only one
+    chunk of parsed objects is held in memory at a time.
+    """
+    total_created = 0
+    total_errors = 0
+    chunks = _read_chunks(lines, chunk_size)
+
+    for number, (first_line, last_line, objects, parse_errors) in enumerate(chunks, start=1):
+        created, errors = _import_chunk(objects) if objects else ([], [])
+        errors = parse_errors + errors
+        total_created += len(created)
+        total_errors += len(errors)
+        yield {
+            "chunk": number,
+            "lines": [first_line, last_line],
+            "created": created,
+            "errors": errors,
+            "total_created": total_created,
+        }
+
+    yield {"done": True, "total_created": total_created, "total_errors": total_errors}
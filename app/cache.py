@@ -0,0 +1,411 @@
+"""
+Read-through cache for read endpoints.
+
+Entries are tagged with the database tables they were built from. Every
+commit that touches a table bumps that table's version (a generation
+counter), which makes all entries built from the previous version stale.
+Writes are picked up from SQLAlchemy session events, so routes never
+invalidate by hand.
+
+Storage is delegated to a backend selected with ``CACHE_BACKEND``:
+
+* ``memory`` - per-process LRU dictionary (default).
+* ``file`` - a directory under ``CACHE_DIR`` shared by every worker on the
+  host, so a write handled by one gunicorn worker invalidates the others.
+* ``package.module:ClassName`` - any ``CacheBackend`` subclass, e.g. a Redis
+  backend, constructed with the app config.
+"""
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked atomic writes
+    fcntl = None
+
+
+# Tables a serialized Pokémon payload is built from.
+POKEMON_TABLES = (
+    "pokemon",
+    "pokemon_type",
+    "type",
+    "region",
+    "mythical_pokemon",
+    "mythical_classification",
+)
+
+_DIRTY_TABLES_KEY = "cache_dirty_tables"
+
+
+class CacheBackend:
+    """
+    Storage interface used by `Cache`.
+
+    Entries are ``(expires_at, versions, value)`` tuples where ``expires_at``
+    is a wall-clock timestamp and ``value`` is JSON-serializable.
+    """
+
+    def __init__(self, config):
+        self.max_entries = config.get("CACHE_MAX_ENTRIES", 1024)
+
+    def get(self, key):
+        """Return the entry stored under `key`, or None."""
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        """Store `entry` under `key`, evicting old entries if needed."""
+        raise NotImplementedError
+
+    def get_versions(self, tables):
+        """Return the current version of each table, in order."""
+        raise NotImplementedError
+
+    def epoch(self):
+        """
+        Token identifying the version counter space.
+
+        It changes whenever the counters are reset, so versions from before a
+        reset are never mistaken for current ones.
+        """
+        raise NotImplementedError
+
+    def bump_versions(self, tables):
+        """Increment the version of each table."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every entry."""
+        raise NotImplementedError
+
+    def size(self):
+        """Number of stored entries."""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU dictionary."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._epoch = uuid.uuid4().hex
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(t, 0) for t in tables)
+
+    def bump_versions(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def epoch(self):
+        return self._epoch
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class FileBackend(CacheBackend):
+    """
+    Directory-backed store shared by every process on the host.
+
+    Each entry is a JSON file named after the hash of its key; access time
+    is tracked through the file mtime for LRU eviction. Table versions live
+    in a single ``versions.json`` guarded by an advisory lock.
+    """
+
+    # Evict at most once every this many writes to keep `set` cheap.
+    EVICT_EVERY = 64
+    # Refresh an entry's mtime on a hit at most this often (seconds), so most
+    # reads do not write to the shared volume.
+    TOUCH_INTERVAL = 60
+    EPOCH_KEY = "__epoch__"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.directory = config.get("CACHE_DIR") or os.path.join(
+            tempfile.gettempdir(), "legendary-pokemon-cache"
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        self._versions_path = os.path.join(self.directory, "versions.json")
+        self._lock_path = os.path.join(self.directory, "versions.lock")
+        self._writes = 0
+
+    def _entry_path(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.entry")
+
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _read_versions(self):
+        try:
+            with open(self._versions_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path) as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                expires_at, versions, value = json.load(f)
+            if time.time() - mtime > self.TOUCH_INTERVAL:
+                os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return expires_at, tuple(versions), value
+
+    def set(self, key, entry):
+        expires_at, versions, value = entry
+        self._write_atomic(self._entry_path(key), [expires_at, list(versions), value])
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".entry"):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_versions(self, tables):
+        versions = self._read_versions()
+        return tuple(versions.get(t, 0) for t in tables)
+
+    def bump_versions(self, tables):
+        with open(self._lock_path, "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            versions = self._read_versions()
+            versions.setdefault(self.EPOCH_KEY, uuid.uuid4().hex)
+            for table in tables:
+                versions[table] = versions.get(table, 0) + 1
+            self._write_atomic(self._versions_path, versions)
+
+    def epoch(self):
+        epoch = self._read_versions().get(self.EPOCH_KEY)
+        if epoch is None:
+            # Persist an epoch so every worker agrees on it.
+            self.bump_versions(())
+            epoch = self._read_versions().get(self.EPOCH_KEY, "")
+        return epoch
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".entry"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def size(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".entry"))
+
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "file": FileBackend,
+}
+
+
+def load_backend(config):
+    """Build the backend named by ``CACHE_BACKEND``."""
+    name = config.get("CACHE_BACKEND", "memory")
+    if name in BACKENDS:
+        return BACKENDS[name](config)
+    module_name, _, class_name = name.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(config)
+
+
+class Cache:
+    """TTL + LRU read-through cache whose entries are invalidated by table versions."""
+
+    def __init__(self, app=None):
+        self.backend = MemoryBackend({})
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+        self.ttl = 300
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read cache settings from the app config and build the backend."""
+        self.enabled = app.config.get("CACHE_ENABLED", True)
+        self.ttl = app.config.get("CACHE_TTL", 300)
+        self.backend = load_backend(app.config)
+        # Only reset this process's counters: a shared backend keeps its entries
+        # across worker restarts and CLI runs, and writes invalidate them.
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+        app.extensions["cache"] = self
+
+    def versions(self, tables):
+        """Return the current version of each table, in order."""
+        return self.backend.get_versions(tables)
+
+    def epoch(self):
+        """Token identifying the current version counter space."""
+        return self.backend.epoch()
+
+    def bump(self, *tables):
+        """Mark the given tables as changed, invalidating dependent entries."""
+        self.backend.bump_versions(tables)
+
+    def get_or_set(self, key, loader, tables):
+        """
+        Return the cached value for `key`, calling `loader` on a miss.
+
+        `tables` lists the tables the value is built from; a commit to any of
+        them invalidates the entry.
+        """
+        if not self.enabled:
+            return loader()
+
+        hit, value, versions = self._lookup(key, tables)
+        if hit:
+            return value
+        value = loader()
+        self._store(key, value, versions, tables)
+        return value
+
+    async def aget_or_set(self, key, loader, tables):
+        """`get_or_set` for an async `loader` (a coroutine function)."""
+        if not self.enabled:
+            return await loader()
+
+        hit, value, versions = self._lookup(key, tables)
+        if hit:
+            return value
+        value = await loader()
+        self._store(key, value, versions, tables)
+        return value
+
+    def _lookup(self, key, tables):
+        """Return ``(hit, value, versions)`` for `key` at the current table versions."""
+        versions = self.versions(tables)
+        entry = self.backend.get(key)
+        if entry and entry[0] > time.time() and tuple(entry[1]) == versions:
+            self._count(hit=True)
+            return True, entry[2], versions
+        self._count(hit=False)
+        return False, None, versions
+
+    def _store(self, key, value, versions, tables):
+        # Skip storing if a write landed while the loader was running.
+        if self.versions(tables) == versions:
+            self.backend.set(key, (time.time() + self.ttl, versions, value))
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters of this process and current backend size."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": self.backend.size(),
+                "max_entries": self.backend.max_entries,
+                "ttl": self.ttl,
+            }
+
+    def track_writes(self, session):
+        """Bump table versions whenever `session` commits a write."""
+        event.listen(session, "after_flush", _collect_flushed_tables)
+        event.listen(session, "do_orm_execute", _collect_executed_tables)
+        event.listen(session, "after_commit", self._after_commit)
+        event.listen(session, "after_rollback", _discard_tables)
+
+    def _after_commit(self, session):
+        tables = session.info.pop(_DIRTY_TABLES_KEY, None)
+        if tables:
+            self.bump(*sorted(tables))
+
+
+def _dirty_tables(session):
+    return session.info.setdefault(_DIRTY_TABLES_KEY, set())
+
+
+def _collect_flushed_tables(session, flush_context):
+    tables = _dirty_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        mapper = inspect(obj).mapper
+        tables.update(t.name for t in mapper.tables)
+        tables.update(
+            rel.secondary.name
+            for rel in mapper.relationships
+            if rel.secondary is not None
+        )
+
+
+def _collect_executed_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            _dirty_tables(orm_execute_state.session).add(table.name)
+
+
+def _discard_tables(session):
+    session.info.pop(_DIRTY_TABLES_KEY, None)
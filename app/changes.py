@@ -0,0 +1,132 @@
+"""
+Delta sync for the Pokémon list.
+
+``GET /api/v1/pokemon/changes?since=TOKEN`` returns the Pokémon inserted or
+updated, and the Pokémon deleted, after the position encoded in ``TOKEN``,
+together with the token to send next time. An empty or missing token
+starts a full sync.
+
+Two streams are read, each with keyset pagination on an indexed
+``(timestamp, id)`` pair:
+
+* upserts - ``pokemon.updated_at``, bumped on every insert and update;
+* deletes - ``pokemon_tombstone.deleted_at``, written by ``DELETE /pokemon/<id>``.
+
+Only rows older than ``CHANGES_SETTLE_SECONDS`` are returned, so a
+transaction that committed late with an earlier timestamp is not skipped
+by a client that already moved past it. A Pokémon only changes when its
+own row does; renaming a region, type or classification does not show up
+in the feed.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, or_, select
+
+from .extensions import db
+from .models import Pokemon, PokemonTombstone
+from .queries import pokemon_rows_query
+from .serializers import serialize_pokemon_rows
+
+
+class InvalidToken(ValueError):
+    """Raised when a client sends a malformed sync token."""
+
+
+def encode_token(position):
+    """Opaque token for ``{"u": (timestamp, id) | None, "d": (timestamp, id) | None}``."""
+    raw = json.dumps(
+        {
+            stream: [ts.isoformat(), row_id] if ts is not None else None
+            for stream, (ts, row_id) in position.items()
+        },
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token):
+    """Decode a sync token; an empty token is the start of both streams."""
+    position = {"u": (None, None), "d": (None, None)}
+    if not token:
+        return position
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        for stream in position:
+            if raw.get(stream) is not None:
+                ts, row_id = raw[stream]
+                if not isinstance(row_id, int):
+                    raise TypeError
+                position[stream] = (datetime.fromisoformat(ts), row_id)
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidToken("Invalid sync token")
+    return position
+
+
+def _after(stamp, id_column, position, horizon, limit):
+    """Keyset statement for ``(stamp, id)`` pairs after `position`, up to `horizon`."""
+    statement = select(stamp, id_column).where(stamp <= horizon)
+    ts, row_id = position
+    if ts is not None:
+        statement = statement.where(
+            or_(stamp > ts, and_(stamp == ts, id_column > row_id))
+        )
+    return statement.order_by(stamp, id_column).limit(limit + 1)
+
+
+def load_changes(token, limit, fields=None):
+    """
+    Changes after `token`, at most `limit` per stream.
+
+    Returns the response payload: ``upserts`` serialized like the list
+    endpoint (restricted to `fields`), ``deletes``, ``next_token`` and
+    ``has_more`` (true while either stream has rows left; poll again
+    immediately with ``next_token``).
+    """
+    position = decode_token(token)
+    horizon = datetime.utcnow() - timedelta(seconds=current_app.config["CHANGES_SETTLE_SECONDS"])
+
+    updated = db.session.execute(
+        _after(Pokemon.updated_at, Pokemon.id, position["u"], horizon, limit)
+    ).all()
+    deleted = db.session.execute(
+        _after(PokemonTombstone.deleted_at, PokemonTombstone.id, position["d"], horizon, limit)
+    ).all()
+    has_more = len(updated) > limit or len(deleted) > limit
+    updated, deleted = updated[:limit], deleted[:limit]
+
+    upserts = []
+    if updated:
+        ids = [row.id for row in updated]
+        rows = pokemon_rows_query(fields).filter(Pokemon.id.in_(ids)).all()
+        by_id = {row[0]: payload for row, payload in zip(rows, serialize_pokemon_rows(rows, fields))}
+        upserts = [by_id[i] for i in ids if i in by_id]
+        position["u"] = tuple(updated[-1])
+
+    deletes = []
+    if deleted:
+        tombstones = db.session.scalars(
+            select(PokemonTombstone)
+            .where(PokemonTombstone.id.in_([row.id for row in deleted]))
+            .order_by(PokemonTombstone.deleted_at, PokemonTombstone.id)
+        )
+        deletes = [
+            {
+                "id": t.pokemon_id,
+                "pokedex_number": t.pokedex_number,
+                "name": t.name,
+                "deleted_at": t.deleted_at.isoformat(),
+            }
+            for t in tombstones
+        ]
+        position["d"] = tuple(deleted[-1])
+
+    return {
+        "upserts": upserts,
+        "deletes": deletes,
+        "next_token": encode_token(position),
+        "has_more": has_more,
+    }
@@ -0,0 +1,179 @@
+"""
+Response compression negotiated from ``Accept-Encoding``.
+
+Responses of a compressible type larger than ``COMPRESSION_MIN_SIZE`` bytes
+are compressed with brotli (when the ``brotli`` package is installed and
+the client accepts it) or gzip, at ``COMPRESSION_BROTLI_QUALITY`` /
+``COMPRESSION_GZIP_LEVEL``. Streamed responses (export, import progress)
+are left alone.
+
+Each encoding is a distinct representation, so it gets its own ETag: the
+`app.http_cache` ETag with ``-gzip`` or ``-br`` appended. Compressed bodies
+of ETagged (cacheable) responses are kept in a per-process LRU bounded by
+``COMPRESSION_CACHE_MAX_BYTES`` and keyed by ``(etag, encoding)``. The
+ETag already encodes the table versions, so `conditional` answers repeat
+requests from it without running the view, serializing or compressing.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import request
+from werkzeug.datastructures import ETags
+from werkzeug.http import parse_accept_header, parse_etags
+
+try:
+    import brotli
+except ImportError:  # optional dependency, see the "speedups" extra
+    brotli = None
+
+
+def _compress(data, encoding, config):
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESSION_BROTLI_QUALITY"])
+    # mtime=0 keeps the bytes identical for identical payloads.
+    return gzip.compress(data, compresslevel=config["COMPRESSION_GZIP_LEVEL"], mtime=0)
+
+
+class BodyCache:
+    """LRU of compressed bodies bounded by their total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, mimetype, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._entries[key] = (mimetype, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+class Compression:
+    """Negotiates, applies and caches response compression."""
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.config = {}
+        self.encodings = ()
+        self.bodies = BodyCache(0)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the settings and compress responses in an after_request hook."""
+        self.enabled = app.config.get("COMPRESSION_ENABLED", True)
+        self.config = {
+            key: app.config[key]
+            for key in (
+                "COMPRESSION_MIN_SIZE",
+                "COMPRESSION_MIMETYPES",
+                "COMPRESSION_GZIP_LEVEL",
+                "COMPRESSION_BROTLI_QUALITY",
+            )
+        }
+        # In order of preference.
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self.bodies = BodyCache(app.config.get("COMPRESSION_CACHE_MAX_BYTES", 0))
+        app.extensions["compression"] = self
+        if self.enabled:
+            # Registered after metrics, so it runs first and metrics see the compressed size.
+            app.after_request(self._after_request)
+
+    def negotiate(self, accept_encoding):
+        """Preferred encoding accepted by an ``Accept-Encoding`` value, or None."""
+        if not self.enabled or not accept_encoding:
+            return None
+        accepted = parse_accept_header(accept_encoding)
+        best = max(self.encodings, key=accepted.quality)
+        return best if accepted.quality(best) > 0 else None
+
+    @staticmethod
+    def tag(etag, encoding):
+        """ETag of the `encoding` representation of the entity tagged `etag`."""
+        return f"{etag}-{encoding}" if encoding else etag
+
+    def matching_etag(self, if_none_match, etag):
+        """The representation tag of `etag` listed in an ``If-None-Match`` value, or None."""
+        tags = if_none_match if isinstance(if_none_match, ETags) else parse_etags(if_none_match)
+        for encoding in (None, *self.encodings):
+            if tags.contains_weak(self.tag(etag, encoding)):
+                return self.tag(etag, encoding)
+        return None
+
+    def cached(self, etag, encoding):
+        """``(mimetype, body)`` of a cached compressed representation, or None."""
+        if not encoding:
+            return None
+        return self.bodies.get((etag, encoding))
+
+    def encode(self, body, mimetype, encoding, etag=None):
+        """
+        Compress `body` when it qualifies; returns ``(body, applied encoding or None)``.
+
+        With an `etag` the compressed bytes are cached for `cached`.
+        """
+        if (
+            not encoding
+            or len(body) < self.config["COMPRESSION_MIN_SIZE"]
+            or mimetype not in self.config["COMPRESSION_MIMETYPES"]
+        ):
+            return body, None
+        compressed = _compress(body, encoding, self.config)
+        if etag:
+            self.bodies.set((etag, encoding), mimetype, compressed)
+        return compressed, encoding
+
+    def _after_request(self, response):
+        if response.mimetype in self.config["COMPRESSION_MIMETYPES"]:
+            response.vary.add("Accept-Encoding")
+        if (
+            response.status_code != 200
+            or response.is_streamed
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        etag, _ = response.get_etag()
+        # Only ETagged responses come from `conditional`, i.e. are cacheable.
+        body, encoding = self.encode(
+            response.get_data(),
+            response.mimetype,
+            self.negotiate(request.headers.get("Accept-Encoding")),
+            etag,
+        )
+        if encoding:
+            response.set_data(body)
+            response.headers["Content-Encoding"] = encoding
+            if etag:
+                response.set_etag(self.tag(etag, encoding))
+        return response
+
+    def stats(self):
+        return {"enabled": self.enabled, "encodings": list(self.encodings), "cache": self.bodies.stats()}
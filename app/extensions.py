@@ -1,13 +1,34 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 
+from .cache import Cache
+from .compression import Compression
+from .instrumentation import Metrics
+from .pokedex_index import PokedexIndex
+from .ratelimit import RateLimiter
+from .replicas import ReplicaRouter, RoutingSession
+
 # Instantiate extensions here so other modules can import them.
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
+cache = Cache()
+cache.track_writes(db.session)
+replicas = ReplicaRouter()
+replicas.track_writes(db.session)
+pokedex_index = PokedexIndex()
+metrics = Metrics()
+limiter = RateLimiter()
+compression = Compression()
 
 
 def register_extensions(app):
     """Initialize Flask extensions with the app."""
     db.init_app(app)
+    replicas.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    pokedex_index.init_app(app)
+    metrics.init_app(app)
+    limiter.init_app(app)
+    compression.init_app(app)
     from . import models  # noqa: F401
@@ -0,0 +1,80 @@
+"""
+HTTP caching for GET endpoints: strong ETags and Cache-Control.
+
+ETags are derived from the versions of the tables an endpoint reads (see
+`app.cache`), not from the response body, so a matching ``If-None-Match``
+is answered with 304 before any query or serialization runs. Compressed
+representations carry the same ETag with the encoding appended and are
+served from `app.compression`'s body cache while the ETag holds.
+"""
+import hashlib
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from .extensions import cache, compression
+
+
+def compute_etag(tables, full_path=None):
+    """Strong ETag for the current URL (or `full_path`) at the current table versions."""
+    versions = ",".join(str(v) for v in cache.versions(tables))
+    raw = f"{cache.epoch()}|{full_path or request.full_path}|{versions}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def max_age_for(blueprint):
+    """Cache-Control max-age configured for a blueprint."""
+    per_blueprint = current_app.config.get("CACHE_CONTROL_MAX_AGE", {})
+    return per_blueprint.get(
+        blueprint, current_app.config.get("CACHE_CONTROL_DEFAULT_MAX_AGE", 60)
+    )
+
+
+def conditional(tables):
+    """
+    Decorator adding ETag/Cache-Control to a GET view reading `tables`.
+
+    Requests whose ``If-None-Match`` matches the current ETag get a 304
+    without calling the view, as do repeat requests for a compressed
+    representation that is still cached.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = compute_etag(tables)
+            matched = compression.matching_etag(request.if_none_match, etag)
+            encoding = compression.negotiate(request.headers.get("Accept-Encoding"))
+            cached = compression.cached(etag, encoding)
+
+            if matched:
+                response = current_app.response_class(status=304)
+                response.set_etag(matched)
+            elif cached:
+                mimetype, body = cached
+                response = current_app.response_class(body, mimetype=mimetype)
+                response.headers["Content-Encoding"] = encoding
+                response.set_etag(compression.tag(etag, encoding))
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response.set_etag(etag)
+
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age_for(request.blueprint)
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def no_store(f):
+    """Decorator marking a GET view's responses as never cacheable."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = make_response(f(*args, **kwargs))
+        response.cache_control.no_store = True
+        return response
+
+    return decorated_function
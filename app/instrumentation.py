@@ -0,0 +1,220 @@
+"""
+Per-request performance instrumentation.
+
+SQLAlchemy cursor events count the statements each request runs and time
+them; Flask request hooks add the wall-clock time, the time spent turning
+rows into JSON (see `serialization_timer`) and the response size. Every
+request gets a ``Server-Timing`` header, and the totals are aggregated per
+URL rule into Prometheus histograms and counters served by
+``/api/v1/metrics``.
+
+Requests that run more than ``QUERY_COUNT_THRESHOLD`` statements are
+logged and counted, which is how N+1 regressions show up.
+
+Only work done before the response is returned is attributed to a
+request: rows queried while a streaming body is being sent are not.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """Timings collected while one request is handled."""
+
+    __slots__ = ("started", "queries", "db_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+def current_stats():
+    """Stats of the request being handled, or None outside an instrumented request."""
+    if not has_app_context():
+        return None
+    return g.get("request_stats")
+
+
+@contextmanager
+def serialization_timer():
+    """Attribute the time spent in the block to the request's serialization time."""
+    stats = current_stats()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serialize_seconds += time.perf_counter() - started
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_stats() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - started.pop()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Collects per-request stats and renders them in Prometheus text format."""
+
+    _events_registered = False
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.query_count_threshold = 0
+        self._lock = threading.Lock()
+        self.reset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the request hooks and the engine events."""
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        self.query_count_threshold = app.config.get("QUERY_COUNT_THRESHOLD", 0)
+        app.extensions["metrics"] = self
+        self.reset()
+        if not self.enabled:
+            return
+
+        # Listening on the Engine class covers every engine (and replica) the app creates.
+        if not Metrics._events_registered:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            Metrics._events_registered = True
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def reset(self):
+        """Drop every collected sample."""
+        with self._lock:
+            self._latency = {}
+            self._query_counts = {}
+            self._counters = {}
+
+    @staticmethod
+    def _before_request():
+        g.request_stats = RequestStats()
+
+    def _after_request(self, response):
+        stats = g.pop("request_stats", None)
+        if stats is None:
+            return response
+        total = time.perf_counter() - stats.started
+
+        response.headers["Server-Timing"] = ", ".join([
+            f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries"',
+            f"serialize;dur={stats.serialize_seconds * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        exceeded = 0 < self.query_count_threshold < stats.queries
+        if exceeded:
+            current_app.logger.warning(
+                "%s %s ran %d SQL statements (threshold %d)",
+                request.method, endpoint, stats.queries, self.query_count_threshold,
+            )
+
+        self._record(
+            endpoint,
+            request.method,
+            response.status_code,
+            stats,
+            total,
+            0 if response.is_streamed else response.calculate_content_length() or 0,
+            exceeded,
+        )
+        return response
+
+    def _record(self, endpoint, method, status, stats, total, size, exceeded):
+        key = (endpoint, method)
+        with self._lock:
+            if key not in self._latency:
+                self._latency[key] = Histogram(LATENCY_BUCKETS)
+                self._query_counts[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self._latency[key].observe(total)
+            self._query_counts[key].observe(stats.queries)
+
+            for name, labels, value in (
+                ("requests_total", key + (status,), 1),
+                ("db_seconds_total", key, stats.db_seconds),
+                ("serialize_seconds_total", key, stats.serialize_seconds),
+                ("response_bytes_total", key, size),
+                ("query_threshold_exceeded_total", key, int(exceeded)),
+            ):
+                counter = self._counters.setdefault(name, {})
+                counter[labels] = counter.get(labels, 0) + value
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, help_text, histograms in (
+                ("pokedex_request_duration_seconds", "Request latency.", self._latency),
+                ("pokedex_request_queries", "SQL statements per request.", self._query_counts),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (endpoint, method), histogram in sorted(histograms.items()):
+                    labels = _labels(endpoint=endpoint, method=method)
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            for name, counter in sorted(self._counters.items()):
+                metric = f"pokedex_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(counter.items()):
+                    names = ("endpoint", "method", "status")[:len(labels)]
+                    lines.append(f"{metric}{{{_labels(**dict(zip(names, labels)))}}} {value}")
+
+        return "\n".join(lines) + "\n"
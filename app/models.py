@@ -1,6 +1,12 @@
 from datetime import datetime
+
+from sqlalchemy.dialects import mysql
+
 from .extensions import db
 
+# Microsecond precision on MySQL, whose DATETIME otherwise truncates to seconds.
+PreciseDateTime = db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
 
 class Region(db.Model):
     """Region where legendary/mythical Pokémon can be found."""
@@ -53,13 +59,20 @@ pokemon_type = db.Table(
     db.Column(
         "type_id", db.Integer, db.ForeignKey("type.id"), primary_key=True
     ),
+    # The primary key covers lookups by pokemon_id; this covers lookups by type.
+    db.Index("ix_pokemon_type_type_id_pokemon_id", "type_id", "pokemon_id"),
 )
 
 
 class Pokemon(db.Model):
     """Legendary or mythical Pokémon."""
     __tablename__ = "pokemon"
-    
+    __table_args__ = (
+        db.Index("ix_pokemon_pokedex_number", "pokedex_number"),
+        db.Index("ix_pokemon_region_id_pokedex_number", "region_id", "pokedex_number"),
+        db.Index("ix_pokemon_updated_at_id", "updated_at", "id"),
+    )
+
     MAX_TYPES = 2  # Pokémon can have at most 2 types
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -70,6 +83,10 @@ class Pokemon(db.Model):
         db.Integer, db.ForeignKey("region.id"), nullable=False
     )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped on every insert and update; drives the change feed.
+    updated_at = db.Column(
+        PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
 
     # Relationships
     region = db.relationship("Region", back_populates="pokemon")
@@ -83,7 +100,12 @@ class Pokemon(db.Model):
     @property
     def image_url(self):
         """Generate image URL based on Pokédex number."""
-        return f"https://www.pokemon.com/static-assets/content-assets/cms2/img/pokedex/full/{self.pokedex_number:03d}.png"
+        return self.image_url_for(self.pokedex_number)
+
+    @staticmethod
+    def image_url_for(pokedex_number):
+        """Image URL for a Pokédex number, without loading a Pokémon."""
+        return f"https://www.pokemon.com/static-assets/content-assets/cms2/img/pokedex/full/{pokedex_number:03d}.png"
 
     def add_type(self, pokemon_type):
         """Add a type to the Pokémon with validation."""
@@ -107,6 +129,13 @@ class Pokemon(db.Model):
 class MythicalPokemon(db.Model):
     """Extra info for mythical Pokémon."""
     __tablename__ = "mythical_pokemon"
+    __table_args__ = (
+        db.Index(
+            "ix_mythical_pokemon_classification_id_pokemon_id",
+            "classification_id",
+            "pokemon_id",
+        ),
+    )
 
     pokemon_id = db.Column(
         db.Integer, db.ForeignKey("pokemon.id"), primary_key=True
@@ -123,3 +152,40 @@ class MythicalPokemon(db.Model):
 
     def __repr__(self):
         return f"<MythicalPokemon pokemon_id={self.pokemon_id}>"
+
+
+class PokemonTombstone(db.Model):
+    """Record of a deleted Pokémon, read by the change feed."""
+    __tablename__ = "pokemon_tombstone"
+    __table_args__ = (
+        db.Index("ix_pokemon_tombstone_deleted_at_id", "deleted_at", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    pokemon_id = db.Column(db.Integer, nullable=False)
+    pokedex_number = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    deleted_at = db.Column(PreciseDateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PokemonTombstone pokemon_id={self.pokemon_id}>"
+
+
+class PokemonStat(db.Model):
+    """
+    Materialized Pokémon counts, maintained incrementally by `app.stats`.
+
+    One row per ``(dimension, member)``: ``total``, ``region``, ``type``,
+    ``classification`` and ``type_pair`` members are ids (pairs as
+    ``"low,high"``). Region rows also track their Pokédex number range.
+    """
+    __tablename__ = "pokemon_stat"
+
+    dimension = db.Column(db.String(20), primary_key=True)
+    member = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    min_dex = db.Column(db.Integer)
+    max_dex = db.Column(db.Integer)
+
+    def __repr__(self):
+        return f"<PokemonStat {self.dimension}:{self.member}={self.count}>"
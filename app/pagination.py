@@ -0,0 +1,96 @@
+"""
+Pagination helpers for Pokémon list endpoints.
+
+Two modes are supported:
+
+* ``?page=N`` - the original offset pagination, kept for compatibility.
+* ``?cursor=TOKEN`` - keyset pagination on ``(pokedex_number, id)``. An empty
+  cursor starts from the beginning; each response carries the ``next_cursor``
+  to request the following page (``null`` on the last page).
+"""
+import base64
+import json
+
+from flask import current_app, request
+from sqlalchemy import and_, or_
+
+from .models import Pokemon
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a malformed cursor token."""
+
+
+def get_per_page():
+    """Read ``per_page`` from the query string, clamped to the configured limit."""
+    default = current_app.config["POKEMON_PER_PAGE"]
+    maximum = current_app.config["POKEMON_MAX_PER_PAGE"]
+    per_page = request.args.get("per_page", default, type=int)
+    return max(1, min(per_page, maximum))
+
+
+def encode_cursor(pokedex_number, pokemon_id):
+    """Build an opaque cursor token pointing after the given row."""
+    raw = json.dumps([pokedex_number, pokemon_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a cursor token into ``(pokedex_number, id)``."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        pokedex_number, pokemon_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(pokedex_number, int) or not isinstance(pokemon_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return pokedex_number, pokemon_id
+
+
+def keyset_page(query, cursor, per_page):
+    """
+    Fetch one keyset page from a query ordered by ``(pokedex_number, id)``.
+
+    Returns ``(items, next_cursor)``. No COUNT query is issued; one extra row
+    is fetched to find out whether another page exists.
+    """
+    rows = keyset_query(query, cursor, per_page).all()
+    return split_keyset_page(rows, per_page)
+
+
+def keyset_query(query, cursor, per_page):
+    """
+    Restrict a query (or select) to the keyset page after `cursor`.
+
+    One row more than `per_page` is fetched; pass the rows to
+    `split_keyset_page`.
+    """
+    if cursor:
+        pokedex_number, pokemon_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                Pokemon.pokedex_number > pokedex_number,
+                and_(
+                    Pokemon.pokedex_number == pokedex_number,
+                    Pokemon.id > pokemon_id,
+                ),
+            )
+        )
+    return query.limit(per_page + 1)
+
+
+def split_keyset_page(rows, per_page):
+    """Split the rows of `keyset_query` into ``(items, next_cursor)``."""
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(last.pokedex_number, last.id)
+    return items, next_cursor
+
+
+def offset_page(query, page, per_page):
+    """Fetch one offset page without the COUNT query ``paginate`` runs by default."""
+    return query.paginate(
+        page=page, per_page=per_page, error_out=False, count=False
+    ).items
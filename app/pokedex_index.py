@@ -0,0 +1,248 @@
+"""
+Optional in-memory index of the whole Pokédex.
+
+The legendary dataset is small, so when ``POKEDEX_INDEX_ENABLED`` is set the
+Pokémon, type, region and mythical tables are loaded once into compact
+tuple-backed records, keyed by Pokédex number, name, type, region and
+classification. Hot lookups are then answered without a database round
+trip. The index is rebuilt lazily when the write routes bump the data
+version of any of those tables (see `app.cache`).
+"""
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+
+from .cache import POKEMON_TABLES
+
+
+class PokemonRecord(NamedTuple):
+    """Compact, immutable row of the index."""
+    id: int
+    name: str
+    pokedex_number: int
+    image_url: str
+    description: Optional[str]
+    region_id: int
+    type_ids: tuple
+    classification_id: Optional[int]
+    created_at: Optional[str]
+
+
+class _IndexState(NamedTuple):
+    version: tuple
+    built_at: float
+    records: dict
+    by_pokedex_number: dict
+    by_name: dict
+    by_type: dict
+    by_region: dict
+    by_classification: dict
+    regions: dict
+    types: dict
+    classifications: dict
+    memory_bytes: int = 0
+
+
+def _sizeof(obj, seen):
+    """Approximate deep size of containers, tuples and scalars."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_sizeof(k, seen) + _sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (tuple, list)):
+        size += sum(_sizeof(item, seen) for item in obj)
+    return size
+
+
+class PokedexIndex:
+    """Lazily (re)built in-memory index of every Pokémon."""
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self._state = None
+        self._cache = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings from the app config; the index is built on first use."""
+        self.enabled = app.config.get("POKEDEX_INDEX_ENABLED", False)
+        self._cache = app.extensions["cache"]
+        self._state = None
+        app.extensions["pokedex_index"] = self
+
+    def _current_version(self):
+        return (self._cache.epoch(), self._cache.versions(POKEMON_TABLES))
+
+    def _get_state(self):
+        version = self._current_version()
+        state = self._state
+        if state is not None and state.version == version:
+            return state
+        with self._lock:
+            state = self._state
+            if state is None or state.version != version:
+                state = self._build(version)
+                self._state = state
+        return state
+
+    def _build(self, version):
+        # Imported here: this module is loaded by app.extensions, which models import.
+        from .extensions import db
+        from .models import Pokemon, Region, Type, MythicalClassification, MythicalPokemon, pokemon_type
+        from .queries import name_key
+
+        session = db.session
+        regions = dict(session.execute(select(Region.id, Region.name)).all())
+        types = dict(session.execute(select(Type.id, Type.name)).all())
+        classifications = dict(
+            session.execute(
+                select(MythicalClassification.id, MythicalClassification.name)
+            ).all()
+        )
+
+        type_ids = defaultdict(list)
+        for pokemon_id, type_id in session.execute(
+            select(pokemon_type.c.pokemon_id, pokemon_type.c.type_id)
+        ):
+            type_ids[pokemon_id].append(type_id)
+
+        classification_ids = dict(
+            session.execute(
+                select(MythicalPokemon.pokemon_id, MythicalPokemon.classification_id)
+            ).all()
+        )
+
+        rows = session.execute(
+            select(
+                Pokemon.id,
+                Pokemon.name,
+                Pokemon.pokedex_number,
+                Pokemon.description,
+                Pokemon.region_id,
+                Pokemon.created_at,
+            ).order_by(Pokemon.pokedex_number, Pokemon.id)
+        )
+
+        records = {}
+        by_pokedex_number = {}
+        by_name = {}
+        by_type = {name_key(name): [] for name in types.values()}
+        by_region = {region_id: [] for region_id in regions}
+        by_classification = {classification_id: [] for classification_id in classifications}
+        for row in rows:
+            record = PokemonRecord(
+                id=row.id,
+                name=row.name,
+                pokedex_number=row.pokedex_number,
+                image_url=Pokemon.image_url_for(row.pokedex_number),
+                description=row.description,
+                region_id=row.region_id,
+                type_ids=tuple(type_ids.get(row.id, ())),
+                classification_id=classification_ids.get(row.id),
+                created_at=row.created_at.isoformat() if row.created_at else None,
+            )
+            records[record.id] = record
+            by_pokedex_number.setdefault(record.pokedex_number, record.id)
+            by_name.setdefault(name_key(record.name), record.id)
+            for type_id in record.type_ids:
+                by_type[name_key(types[type_id])].append(record.id)
+            by_region[record.region_id].append(record.id)
+            if record.classification_id is not None:
+                by_classification[record.classification_id].append(record.id)
+
+        def freeze(index):
+            return {key: tuple(ids) for key, ids in index.items()}
+
+        state = _IndexState(
+            version=version,
+            built_at=time.time(),
+            records=records,
+            by_pokedex_number=by_pokedex_number,
+            by_name=by_name,
+            by_type=freeze(by_type),
+            by_region=freeze(by_region),
+            by_classification=freeze(by_classification),
+            regions=regions,
+            types=types,
+            classifications=classifications,
+        )
+        # Measured once here: walking the whole index is too slow for every /health call.
+        return state._replace(memory_bytes=_sizeof(state, set()))
+
+    @staticmethod
+    def _serialize(state, record):
+        """Serialize a record to the same shape as `serialize_pokemon`."""
+        return {
+            "id": record.id,
+            "name": record.name,
+            "pokedex_number": record.pokedex_number,
+            "image_url": record.image_url,
+            "description": record.description,
+            "region": {"id": record.region_id, "name": state.regions[record.region_id]},
+            "types": [{"id": t, "name": state.types[t]} for t in record.type_ids],
+            "mythical_info": (
+                {"classification": state.classifications[record.classification_id]}
+                if record.classification_id is not None
+                else None
+            ),
+            "created_at": record.created_at,
+        }
+
+    def _lookup_one(self, index_name, key):
+        state = self._get_state()
+        pokemon_id = getattr(state, index_name).get(key)
+        if pokemon_id is None:
+            return None
+        return self._serialize(state, state.records[pokemon_id])
+
+    def _lookup_many(self, index_name, key):
+        state = self._get_state()
+        ids = getattr(state, index_name).get(key)
+        if ids is None:
+            return None
+        return [self._serialize(state, state.records[i]) for i in ids]
+
+    def get_by_pokedex_number(self, pokedex_number):
+        """Serialized Pokémon with the given Pokédex number, or None."""
+        return self._lookup_one("by_pokedex_number", pokedex_number)
+
+    def get_by_name(self, name):
+        """Serialized Pokémon with the given name (compared by `name_key`), or None."""
+        from .queries import name_key  # see _build for why this is imported here
+
+        return self._lookup_one("by_name", name_key(name))
+
+    def list_by_type(self, type_name):
+        """Serialized Pokémon of a type (compared by `name_key`); None if the type is unknown."""
+        from .queries import name_key  # see _build for why this is imported here
+
+        return self._lookup_many("by_type", name_key(type_name))
+
+    def list_by_region(self, region_id):
+        """Serialized Pokémon from a region; None if the region is unknown."""
+        return self._lookup_many("by_region", region_id)
+
+    def list_by_classification(self, classification_id):
+        """Serialized Pokémon with a mythical classification; None if it is unknown."""
+        return self._lookup_many("by_classification", classification_id)
+
+    def stats(self):
+        """Size of the index and its approximate memory footprint."""
+        state = self._state
+        if not self.enabled or state is None:
+            return {"enabled": self.enabled, "built": False}
+        return {
+            "enabled": True,
+            "built": True,
+            "records": len(state.records),
+            "built_at": state.built_at,
+            "memory_bytes": state.memory_bytes,
+        }
@@ -0,0 +1,76 @@
+"""
+Connection pool with checkout wait statistics.
+
+`TimedQueuePool` is a `QueuePool` that measures how long each checkout
+waits for a connection, so pool starvation under bursty traffic shows up
+in `/api/v1/health` (see `pool_stats`) instead of only as slow requests.
+"""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait times and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def recreate(self):
+        # Invalidation recreates the pool; carry the statistics over.
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        pool.timeouts = self.timeouts
+        return pool
+
+
+def pool_stats(engine):
+    """Occupancy of an engine's pool, plus checkout waits for `TimedQueuePool`."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"class": type(pool).__name__}
+
+    # max_overflow=-1 means the pool never blocks, so it cannot saturate.
+    capacity = pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None
+    stats = {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "wait_ms_avg": round(pool.wait_seconds_total / pool.checkouts * 1000, 3)
+            if pool.checkouts else 0.0,
+            "wait_ms_max": round(pool.wait_seconds_max * 1000, 3),
+        })
+    return stats
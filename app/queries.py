@@ -0,0 +1,224 @@
+"""
+Shared query builders for the Pokémon endpoints.
+
+Every endpoint that serializes Pokémon should build its query from here so
+that region, types and mythical classification are loaded up front instead
+of lazily, one row at a time. Read endpoints use the row-tuple queries
+(`pokemon_rows_query` and the builders on top of it) together with
+`app.serializers.serialize_pokemon_rows`; `pokemon_query` returns eager
+loaded ORM instances for code that needs them.
+"""
+import unicodedata
+
+from sqlalchemy import String, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.sql.functions import FunctionElement
+
+from .extensions import db
+from .models import Pokemon, Region, Type, MythicalClassification, MythicalPokemon
+
+
+def name_key(name):
+    """
+    Comparison key for Pokémon names: case- and accent-insensitive.
+
+    MySQL's default collation treats "Mew", "mew" and "Mëw" as equal for the
+    unique ``name`` index, so duplicates found in Python must agree with it.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class _NameKey(FunctionElement):
+    """`name_key` of a column, computed by the database."""
+    type = String()
+    name = "name_key"
+    inherit_cache = True
+
+
+@compiles(_NameKey)
+def _compile_name_key(element, compiler, **kw):
+    # SQLite compares exactly; apply the Python function registered below.
+    return f"name_key({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(_NameKey, "mysql")
+def _compile_name_key_mysql(element, compiler, **kw):
+    # The column's collation already folds case and accents; keep the index usable.
+    return compiler.process(element.clauses, **kw)
+
+
+@event.listens_for(Engine, "connect")
+def _register_name_key(dbapi_connection, connection_record):
+    if hasattr(dbapi_connection, "create_function"):  # sqlite3 and aiosqlite
+        dbapi_connection.create_function("name_key", 1, name_key, deterministic=True)
+
+
+def name_key_in(column, names):
+    """
+    Criterion matching rows whose `column` equals one of `names` under `name_key`.
+
+    This is the rule the in-memory index uses, so lookups answer the same
+    with and without it.
+    """
+    return _NameKey(column).in_({name_key(n) for n in names})
+
+
+def pokemon_name_in(names):
+    """Criterion matching Pokémon named one of `names` (see `name_key_in`)."""
+    return name_key_in(Pokemon.name, names)
+
+
+def pokemon_load_options():
+    """Loader options covering every relationship used by serialize_pokemon."""
+    return (
+        joinedload(Pokemon.region),
+        selectinload(Pokemon.types),
+        joinedload(Pokemon.mythical_info).joinedload(MythicalPokemon.classification),
+    )
+
+
+def pokemon_query():
+    """Base Pokémon query with all serialized relationships eager loaded."""
+    return Pokemon.query.options(*pokemon_load_options())
+
+
+def pokemon_rows_query(fields=None):
+    """
+    Pokémon as plain row tuples with region and classification joined in.
+
+    Rows carry every column `serialize_pokemon_rows` needs except the types,
+    which it loads with one extra query per batch of rows. The serializer
+    unpacks full rows positionally, so keep the column order in sync with it.
+
+    With `fields` (see `app.serializers.parse_fields`) only the columns and
+    joins those fields need are selected; ``id`` and ``pokedex_number`` are
+    always included for ordering and pagination.
+    """
+    if fields is None:
+        return (
+            db.session.query(
+                Pokemon.id,
+                Pokemon.name,
+                Pokemon.pokedex_number,
+                Pokemon.description,
+                Pokemon.created_at,
+                Pokemon.region_id,
+                Region.name.label("region_name"),
+                MythicalClassification.name.label("classification"),
+            )
+            .join(Region, Region.id == Pokemon.region_id)
+            .outerjoin(MythicalPokemon, MythicalPokemon.pokemon_id == Pokemon.id)
+            .outerjoin(
+                MythicalClassification,
+                MythicalClassification.id == MythicalPokemon.classification_id,
+            )
+        )
+
+    columns = [Pokemon.id, Pokemon.pokedex_number]
+    for field, column in (
+        ("name", Pokemon.name),
+        ("description", Pokemon.description),
+        ("created_at", Pokemon.created_at),
+    ):
+        if field in fields:
+            columns.append(column)
+    if "region" in fields:
+        columns += [Pokemon.region_id, Region.name.label("region_name")]
+    if "mythical_info" in fields:
+        columns.append(MythicalClassification.name.label("classification"))
+
+    query = db.session.query(*columns)
+    if "region" in fields:
+        query = query.join(Region, Region.id == Pokemon.region_id)
+    if "mythical_info" in fields:
+        query = (
+            query
+            .outerjoin(MythicalPokemon, MythicalPokemon.pokemon_id == Pokemon.id)
+            .outerjoin(
+                MythicalClassification,
+                MythicalClassification.id == MythicalPokemon.classification_id,
+            )
+        )
+    return query
+
+
+def pokemon_list_query(fields=None):
+    """Pokémon rows ordered by Pokédex number, for list endpoints."""
+    return pokemon_rows_query(fields).order_by(
+        Pokemon.pokedex_number.asc(), Pokemon.id.asc()
+    )
+
+
+def pokemon_by_type_query(type_id, fields=None):
+    """Pokémon having the given type, ordered by Pokédex number."""
+    return (
+        pokemon_list_query(fields)
+        .filter(Pokemon.types.any(Type.id == type_id))
+    )
+
+
+def pokemon_by_classification_query(classification_id, fields=None):
+    """Pokémon with the given mythical classification, ordered by Pokédex number."""
+    return (
+        pokemon_list_query(fields)
+        .filter(
+            Pokemon.mythical_info.has(
+                MythicalPokemon.classification_id == classification_id
+            )
+        )
+    )
+
+
+def _match(model, value):
+    """Filter a reference model by numeric id or by name."""
+    if isinstance(value, int):
+        return model.id == value
+    return model.name == value
+
+
+def pokemon_search_filters(
+    types=(),
+    region=None,
+    classification=None,
+    dex_min=None,
+    dex_max=None,
+    name_prefix=None,
+):
+    """
+    SQL criteria selecting Pokémon that match every given filter.
+
+    `types`, `region` and `classification` accept ids or names; a Pokémon
+    must have all of the listed types.
+    """
+    criteria = [Pokemon.types.any(_match(Type, t)) for t in types]
+
+    if region is not None:
+        criteria.append(Pokemon.region.has(_match(Region, region)))
+
+    if classification is not None:
+        criteria.append(
+            Pokemon.mythical_info.has(
+                MythicalPokemon.classification.has(
+                    _match(MythicalClassification, classification)
+                )
+            )
+        )
+
+    if dex_min is not None:
+        criteria.append(Pokemon.pokedex_number >= dex_min)
+
+    if dex_max is not None:
+        criteria.append(Pokemon.pokedex_number <= dex_max)
+
+    if name_prefix:
+        criteria.append(Pokemon.name.startswith(name_prefix, autoescape=True))
+
+    return criteria
+
+
+def pokemon_search_query(fields=None, **filters):
+    """Pokémon matching every filter of `pokemon_search_filters`, as a single SQL query."""
+    return pokemon_list_query(fields).filter(*pokemon_search_filters(**filters))
@@ -0,0 +1,330 @@
+"""
+Rate limiting and admission control.
+
+`RateLimiter` gives every client a token bucket per blueprint: requests
+spend one token, tokens refill at ``rate`` per second up to ``burst``, and
+a request finding the bucket empty gets a 429 with ``Retry-After``. Clients
+sending a valid ``X-API-Key`` are limited per key, everyone else per IP
+address. Limits are configured per blueprint with ``RATELIMITS`` (``None``
+disables limiting for that blueprint), falling back to ``RATELIMIT_DEFAULT``.
+
+Buckets live in a store selected with ``RATELIMIT_STORAGE``:
+
+* ``memory`` - per process (default); each worker enforces the limit alone.
+* ``file`` - a directory under ``RATELIMIT_DIR`` shared by every worker on
+  the host, so the limit holds for the whole host.
+* ``package.module:ClassName`` - any ``BucketStore`` subclass, e.g. a Redis
+  store shared across hosts, constructed with the app config.
+
+`limit_concurrency` additionally caps how many requests of an expensive
+endpoint run at once in a process (``CONCURRENCY_LIMITS``), so a burst of
+exports or searches cannot hold every pooled database connection.
+"""
+import hashlib
+import hmac
+import importlib
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked updates
+    fcntl = None
+
+
+def take_token(state, rate, burst, now):
+    """
+    Refill a bucket ``(tokens, updated_at)`` and try to spend one token.
+
+    Returns ``(new_state, retry_after)``; `retry_after` is 0 when the
+    request is admitted, otherwise the seconds until a token is available.
+    """
+    tokens, updated_at = state if state else (burst, now)
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class BucketStore:
+    """Storage interface used by `RateLimiter`."""
+
+    def __init__(self, config):
+        self.max_keys = config.get("RATELIMIT_MAX_KEYS", 10000)
+
+    def take(self, key, rate, burst, now):
+        """Atomically spend a token from bucket `key`; returns the retry-after seconds."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryBucketStore(BucketStore):
+    """Per-process buckets, dropping the least recently used beyond ``max_keys``."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now):
+        with self._lock:
+            state, retry_after = take_token(self._buckets.get(key), rate, burst, now)
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class FileBucketStore(BucketStore):
+    """
+    Buckets shared by every process on the host.
+
+    Each bucket is a small JSON file named after the hash of its key,
+    updated under an advisory lock on the file itself. Every
+    ``SWEEP_INTERVAL`` seconds a process removes buckets idle long enough
+    to have refilled (``burst / rate``), which is the same as a missing
+    bucket, then the least recently used ones beyond ``max_keys``.
+    """
+
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.directory = config.get("RATELIMIT_DIR") or os.path.join(
+            tempfile.gettempdir(), "legendary-pokemon-ratelimit"
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        self._refill_seconds = 0.0
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.bucket")
+
+    def take(self, key, rate, burst, now):
+        with open(self._path(key), "a+") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = tuple(json.load(f))
+            except ValueError:
+                state = None
+            state, retry_after = take_token(state, rate, burst, now)
+            f.seek(0)
+            f.truncate()
+            json.dump(state, f)
+        self._refill_seconds = max(self._refill_seconds, burst / rate)
+        if now >= self._next_sweep:
+            self.sweep(now)
+        return retry_after
+
+    def _buckets(self):
+        """``(mtime, path)`` of every bucket file."""
+        buckets = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".bucket"):
+                try:
+                    buckets.append((entry.stat().st_mtime, entry.path))
+                except OSError:  # removed by another process
+                    pass
+        return buckets
+
+    def sweep(self, now):
+        """Remove refilled buckets, then the oldest beyond ``max_keys``."""
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.SWEEP_INTERVAL
+        buckets = sorted(self._buckets(), reverse=True)  # most recently used first
+        expired = {path for mtime, path in buckets if now - mtime > self._refill_seconds}
+        expired.update(path for _, path in buckets[self.max_keys:])
+        for path in expired:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for _, path in self._buckets():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+STORES = {
+    "memory": MemoryBucketStore,
+    "file": FileBucketStore,
+}
+
+
+def load_store(config):
+    """Build the bucket store named by ``RATELIMIT_STORAGE``."""
+    name = config.get("RATELIMIT_STORAGE", "memory")
+    if name in STORES:
+        return STORES[name](config)
+    module_name, _, class_name = name.partition(":")
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    return store_class(config)
+
+
+def client_identity(api_key, remote_addr):
+    """Bucket identity: the API key when it is valid, the client IP otherwise."""
+    expected = os.environ.get("API_KEY")
+    if api_key and expected and hmac.compare_digest(api_key, expected):
+        # Never keep the key itself in the store.
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return f"ip:{remote_addr or 'unknown'}"
+
+
+def too_many_requests(retry_after):
+    """429 response telling the client when to retry."""
+    response = jsonify({"error": "Too many requests"})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+class RateLimiter:
+    """Token-bucket limits per client and blueprint, plus per-endpoint concurrency caps."""
+
+    def __init__(self, app=None):
+        self.store = MemoryBucketStore({})
+        self.enabled = False
+        self.limits = {}
+        self.default_limit = None
+        self.concurrency_limits = {}
+        self._semaphores = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.limited = 0
+        self.shed = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the limits from the app config and register the request hook."""
+        self.enabled = app.config.get("RATELIMIT_ENABLED", True)
+        self.limits = app.config.get("RATELIMITS", {})
+        self.default_limit = app.config.get("RATELIMIT_DEFAULT")
+        self.concurrency_limits = app.config.get("CONCURRENCY_LIMITS", {})
+        self.store = load_store(app.config)
+        self.store.clear()
+        self._semaphores = {}
+        self._in_flight = {}
+        self.limited = 0
+        self.shed = 0
+        app.extensions["ratelimit"] = self
+        if self.enabled:
+            app.before_request(self._before_request)
+
+    def limit_for(self, blueprint):
+        """``(rate, burst)`` configured for a blueprint, or None when unlimited."""
+        return self.limits.get(blueprint, self.default_limit)
+
+    def hit(self, blueprint, identity):
+        """Spend a token for `identity` on `blueprint`; returns retry-after seconds or 0."""
+        limit = self.limit_for(blueprint)
+        if not self.enabled or not limit:
+            return 0.0
+        rate, burst = limit
+        retry_after = self.store.take(f"{blueprint}:{identity}", rate, burst, time.time())
+        if retry_after:
+            with self._lock:
+                self.limited += 1
+        return retry_after
+
+    def _before_request(self):
+        if request.method == "OPTIONS":  # CORS preflight
+            return None
+        identity = client_identity(request.headers.get("X-API-Key"), request.remote_addr)
+        retry_after = self.hit(request.blueprint, identity)
+        if retry_after:
+            return too_many_requests(retry_after)
+        return None
+
+    def acquire(self, name):
+        """Take a concurrency slot for endpoint `name` without waiting; False when full."""
+        maximum = self.concurrency_limits.get(name)
+        if not self.enabled or not maximum:
+            return True
+        with self._lock:
+            if name not in self._semaphores:
+                self._semaphores[name] = threading.BoundedSemaphore(maximum)
+                self._in_flight[name] = 0
+            semaphore = self._semaphores[name]
+        if not semaphore.acquire(blocking=False):
+            with self._lock:
+                self.shed += 1
+            return False
+        with self._lock:
+            self._in_flight[name] += 1
+        return True
+
+    def release(self, name):
+        if name not in self._semaphores:
+            return
+        with self._lock:
+            self._in_flight[name] -= 1
+        self._semaphores[name].release()
+
+    def stats(self):
+        """Rejection counters of this process and the current concurrency slots."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "storage": type(self.store).__name__,
+                "rate_limited": self.limited,
+                "concurrency_rejected": self.shed,
+                "in_flight": {
+                    name: f"{count}/{self.concurrency_limits[name]}"
+                    for name, count in self._in_flight.items()
+                },
+            }
+
+
+def limit_concurrency(name):
+    """
+    Decorator capping how many requests of a view run at once (``CONCURRENCY_LIMITS[name]``).
+
+    Requests over the cap get a 429 straight away instead of queueing for a
+    database connection. Streamed responses keep their slot until the body
+    has been sent.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limiter = current_app.extensions["ratelimit"]
+            if not limiter.acquire(name):
+                return too_many_requests(1)
+            try:
+                response = current_app.make_response(f(*args, **kwargs))
+            except BaseException:
+                limiter.release(name)
+                raise
+            if response.is_streamed:
+                response.call_on_close(lambda: limiter.release(name))
+            else:
+                limiter.release(name)
+            return response
+
+        return decorated_function
+
+    return decorator
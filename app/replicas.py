@@ -0,0 +1,145 @@
+"""
+Read-replica routing.
+
+When ``SQLALCHEMY_REPLICA_URIS`` lists one or more read-only databases,
+an engine is created for each (with the primary's engine options) and
+`RoutingSession` sends the SELECTs of ``GET``/``HEAD`` requests to one of
+them, chosen round-robin per request. Everything else - writes,
+flushes and every statement of a ``POST``/``DELETE`` request - stays on the
+primary, so route code does not change.
+
+Reads stick to the primary for ``REPLICA_STICKY_SECONDS`` after a write:
+
+* process-wide, so the read-through cache is not refilled from a replica
+  that has not caught up yet, and
+* per client, through a cookie set on the response to the write, so the
+  client reads its own writes whichever worker serves it next.
+"""
+import itertools
+import threading
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.sql import Select
+
+STICKY_COOKIE = "read_primary_until"
+READ_METHODS = ("GET", "HEAD")
+_WROTE_KEY = "replicas_wrote"
+
+
+def mark_write(session):
+    """
+    Record that `session` wrote, for writes SQLAlchemy does not see.
+
+    Flushes and ``session.execute(insert/update/delete)`` are noticed
+    automatically; raw driver statements (``exec_driver_sql``) are not.
+    """
+    session.info[_WROTE_KEY] = True
+
+
+class ReplicaRouter:
+    """Chooses the engine reads of the current request go to."""
+
+    def __init__(self, app=None):
+        self.engines = []
+        self.sticky_seconds = 0
+        self._cycle = None
+        self._lock = threading.Lock()
+        self._primary_until = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    @property
+    def enabled(self):
+        return bool(self.engines)
+
+    def init_app(self, app):
+        """Create an engine per replica URI."""
+        options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+        self.engines = [
+            create_engine(uri, **options)
+            for uri in app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+        ]
+        self.sticky_seconds = app.config.get("REPLICA_STICKY_SECONDS", 5)
+        self._cycle = itertools.cycle(self.engines)
+        self._primary_until = 0.0
+        app.extensions["replicas"] = self
+        if self.engines:
+            app.after_request(self._set_sticky_cookie)
+
+    def track_writes(self, session):
+        """
+        Start the read-your-writes window whenever `session` commits a write.
+
+        Writes are flushes and the set-based statements run through
+        ``session.execute`` - the same signal the cache bumps table versions on.
+        """
+
+        @event.listens_for(session, "after_flush")
+        def after_flush(session, flush_context):
+            mark_write(session)
+
+        @event.listens_for(session, "do_orm_execute")
+        def after_execute(orm_execute_state):
+            if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+                mark_write(orm_execute_state.session)
+
+        @event.listens_for(session, "after_commit")
+        def after_commit(session):
+            if not session.info.pop(_WROTE_KEY, False) or not self.enabled:
+                return
+            until = time.time() + self.sticky_seconds
+            self._primary_until = until
+            if has_request_context():
+                g.read_primary_until = until
+
+        @event.listens_for(session, "after_rollback")
+        def after_rollback(session):
+            session.info.pop(_WROTE_KEY, None)
+
+    def _set_sticky_cookie(self, response):
+        until = g.pop("read_primary_until", None)
+        if until is not None:
+            response.set_cookie(
+                STICKY_COOKIE,
+                f"{until:.3f}",
+                max_age=max(int(self.sticky_seconds), 1),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _sticky(self):
+        now = time.time()
+        if now < self._primary_until:
+            return True
+        try:
+            return now < float(request.cookies.get(STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+
+    def read_engine(self):
+        """Replica engine for the current request's reads, or None for the primary."""
+        if not self.engines or not has_request_context() or request.method not in READ_METHODS:
+            return None
+        if "replica_engine" not in g:
+            if self._sticky():
+                g.replica_engine = None
+            else:
+                with self._lock:
+                    g.replica_engine = next(self._cycle)
+        return g.replica_engine
+
+
+class RoutingSession(Session):
+    """Session sending SELECTs of read requests to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and isinstance(clause, Select) and not self._flushing and has_app_context():
+            router = current_app.extensions.get("replicas")
+            engine = router.read_engine() if router is not None else None
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
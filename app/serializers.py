@@ -0,0 +1,220 @@
+"""
+Fast serialization of Pokémon payloads.
+
+List and detail endpoints read plain row tuples (see
+`app.queries.pokemon_rows_query`) instead of ORM instances and turn them
+into payloads here. The parts of a payload that never change for a given
+key - image URL, region, type and classification sub-objects - are
+memoized and shared between payloads, so they must be treated as
+read-only.
+
+When ``orjson`` is installed it replaces the stdlib encoder through
+Flask's ``app.json`` provider hook; otherwise the stdlib provider stays.
+"""
+from collections import defaultdict
+from functools import lru_cache
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+
+from .extensions import db
+from .instrumentation import serialization_timer
+from .models import Pokemon, Type, pokemon_type
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+# Payload fields in output order.
+POKEMON_FIELDS = (
+    "id",
+    "name",
+    "pokedex_number",
+    "image_url",
+    "description",
+    "region",
+    "types",
+    "mythical_info",
+    "created_at",
+)
+
+
+class InvalidFields(ValueError):
+    """Raised when a client requests unknown fields."""
+
+
+def parse_fields(value):
+    """
+    Parse a ``?fields=`` value into a tuple of fields in output order.
+
+    Returns None (the full payload) when `value` is empty or selects every field.
+    """
+    if not value:
+        return None
+    requested = {f.strip() for f in value.split(",") if f.strip()}
+    unknown = sorted(requested - set(POKEMON_FIELDS))
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {unknown}")
+    if not requested or requested == set(POKEMON_FIELDS):
+        return None
+    return tuple(f for f in POKEMON_FIELDS if f in requested)
+
+
+def trim_payload(payload, fields):
+    """Restrict a full payload to `fields` (None keeps everything)."""
+    if fields is None:
+        return payload
+    return {f: payload[f] for f in fields}
+
+
+@lru_cache(maxsize=4096)
+def image_url(pokedex_number):
+    """Memoized image URL for a Pokédex number."""
+    return Pokemon.image_url_for(pokedex_number)
+
+
+@lru_cache(maxsize=1024)
+def reference(ref_id, name):
+    """Memoized ``{"id", "name"}`` sub-object for a region or type."""
+    return {"id": ref_id, "name": name}
+
+
+@lru_cache(maxsize=256)
+def mythical_info(classification):
+    """Memoized ``mythical_info`` sub-object for a classification name."""
+    return {"classification": classification}
+
+
+def types_statement(pokemon_ids):
+    """``(pokemon_id, type_id, type_name)`` rows for the given Pokémon."""
+    return (
+        select(pokemon_type.c.pokemon_id, Type.id, Type.name)
+        .join(Type, Type.id == pokemon_type.c.type_id)
+        .where(pokemon_type.c.pokemon_id.in_(pokemon_ids))
+        .order_by(pokemon_type.c.pokemon_id, Type.id)
+    )
+
+
+def group_types(rows):
+    """Map each Pokémon id to its type sub-objects, from `types_statement` rows."""
+    types = defaultdict(list)
+    for pokemon_id, type_id, type_name in rows:
+        types[pokemon_id].append(reference(type_id, type_name))
+    return types
+
+
+def load_types(pokemon_ids):
+    """Map each Pokémon id to its type sub-objects, with one query."""
+    if not pokemon_ids:
+        return defaultdict(list)
+    return group_types(db.session.execute(types_statement(pokemon_ids)))
+
+
+def serialize_pokemon_row(row, types):
+    """Serialize one row of `pokemon_rows_query` to the public payload shape."""
+    # Tuple unpacking is several times faster than named attribute access on Row.
+    (
+        pokemon_id,
+        name,
+        pokedex_number,
+        description,
+        created_at,
+        region_id,
+        region_name,
+        classification,
+    ) = row
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "pokedex_number": pokedex_number,
+        "image_url": image_url(pokedex_number),
+        "description": description,
+        "region": reference(region_id, region_name),
+        "types": types,
+        "mythical_info": mythical_info(classification) if classification else None,
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+_FIELD_GETTERS = {
+    "id": lambda row, types: row.id,
+    "name": lambda row, types: row.name,
+    "pokedex_number": lambda row, types: row.pokedex_number,
+    "image_url": lambda row, types: image_url(row.pokedex_number),
+    "description": lambda row, types: row.description,
+    "region": lambda row, types: reference(row.region_id, row.region_name),
+    "types": lambda row, types: types.get(row.id, []),
+    "mythical_info": lambda row, types: (
+        mythical_info(row.classification) if row.classification else None
+    ),
+    "created_at": lambda row, types: (
+        row.created_at.isoformat() if row.created_at else None
+    ),
+}
+
+
+def needs_types(fields):
+    """Whether payloads restricted to `fields` include the types."""
+    return fields is None or "types" in fields
+
+
+def serialize_pokemon_rows(rows, fields=None):
+    """
+    Serialize rows of `pokemon_rows_query`.
+
+    Types are loaded with one query, and only when `fields` includes them.
+    """
+    types = load_types([row[0] for row in rows]) if needs_types(fields) else {}
+    return build_payloads(rows, types, fields)
+
+
+def build_payloads(rows, types, fields=None):
+    """Serialize rows of `pokemon_rows_query` given their already loaded `types`."""
+    with serialization_timer():
+        if fields is None:
+            return [serialize_pokemon_row(row, types.get(row[0], [])) for row in rows]
+        getters = [(f, _FIELD_GETTERS[f]) for f in fields]
+        return [{f: getter(row, types) for f, getter in getters} for row in rows]
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Stdlib JSON provider that reports encoding time to the request metrics."""
+
+    def response(self, *args, **kwargs):
+        with serialization_timer():
+            return super().response(*args, **kwargs)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, matching the default provider's output options."""
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def _dumps(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        with serialization_timer():
+            body = self._dumps(obj, indent=indent) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def register_json_provider(app):
+    """Use the orjson provider when available, unless JSON_PROVIDER is "stdlib"."""
+    if orjson is not None and app.config.get("JSON_PROVIDER", "auto") != "stdlib":
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = TimedJSONProvider(app)
@@ -0,0 +1,318 @@
+"""
+Materialized Pokémon statistics.
+
+`PokemonStat` holds the counts served by ``GET /api/v1/stats``: the total,
+Pokémon per region (with the covered Pokédex number range), per type, per
+mythical classification and per type combination. Every write path keeps
+it current inside its own transaction:
+
+* `record_created` adds a batch of new Pokémon with one upsert statement;
+* `record_deleted` subtracts deleted Pokémon with one executemany UPDATE
+  and re-reads the Pokédex range of the affected regions from the
+  ``(region_id, pokedex_number)`` index with one more.
+
+Reads therefore cost one primary-key ordered scan of a table bounded by the
+number of reference rows, never a GROUP BY over ``pokemon``. `rebuild_stats`
+recomputes everything from scratch (``flask stats rebuild``) for recovery
+or after a migration.
+"""
+from collections import Counter, namedtuple
+
+from sqlalchemy import Integer, bindparam, cast, delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, sqlite
+
+from .extensions import db
+from .models import (
+    Pokemon,
+    PokemonStat,
+    Region,
+    Type,
+    MythicalClassification,
+    MythicalPokemon,
+    pokemon_type,
+)
+
+# Tables `GET /stats` is built from.
+STATS_TABLES = ("pokemon_stat", "region", "type", "mythical_classification")
+
+# Classification member of Pokémon without mythical info.
+UNCLASSIFIED = "none"
+
+PokemonFacts = namedtuple("PokemonFacts", "pokedex_number region_id type_ids classification_id")
+
+
+def _members(facts):
+    """The ``(dimension, member)`` rows one Pokémon counts towards."""
+    type_ids = sorted(set(facts.type_ids))
+    members = [
+        ("total", ""),
+        ("region", str(facts.region_id)),
+        ("classification", str(facts.classification_id) if facts.classification_id else UNCLASSIFIED),
+    ]
+    members += [("type", str(t)) for t in type_ids]
+    if type_ids:
+        members.append(("type_pair", ",".join(map(str, type_ids))))
+    return members
+
+
+def _deltas(pokemon):
+    counts = Counter()
+    ranges = {}
+    for facts in pokemon:
+        counts.update(_members(facts))
+        low, high = ranges.get(facts.region_id, (facts.pokedex_number, facts.pokedex_number))
+        ranges[facts.region_id] = (min(low, facts.pokedex_number), max(high, facts.pokedex_number))
+    return counts, ranges
+
+
+def _upsert(rows):
+    """Add the counts of `rows` to the summary, widening region ranges, in one statement."""
+    table = PokemonStat.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(table).values(rows)
+        new = statement.inserted
+        statement = statement.on_duplicate_key_update(
+            count=table.c.count + new.count,
+            min_dex=func.least(func.coalesce(table.c.min_dex, new.min_dex), new.min_dex),
+            max_dex=func.greatest(func.coalesce(table.c.max_dex, new.max_dex), new.max_dex),
+        )
+    elif dialect == "sqlite":
+        statement = sqlite.insert(table).values(rows)
+        new = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.dimension, table.c.member],
+            set_={
+                # Two-argument min()/max() are scalar functions in SQLite.
+                "count": table.c.count + new.count,
+                "min_dex": func.min(func.coalesce(table.c.min_dex, new.min_dex), new.min_dex),
+                "max_dex": func.max(func.coalesce(table.c.max_dex, new.max_dex), new.max_dex),
+            },
+        )
+    else:
+        for row in rows:
+            current = db.session.get(PokemonStat, (row["dimension"], row["member"]))
+            if current is None:
+                db.session.add(PokemonStat(**row))
+                continue
+            current.count += row["count"]
+            if row["min_dex"] is not None:
+                # Like coalesce() above: an emptied region has no range left.
+                current.min_dex = (
+                    row["min_dex"] if current.min_dex is None else min(current.min_dex, row["min_dex"])
+                )
+                current.max_dex = (
+                    row["max_dex"] if current.max_dex is None else max(current.max_dex, row["max_dex"])
+                )
+        return
+    db.session.execute(statement)
+
+
+def record_created(pokemon):
+    """Count newly inserted Pokémon (an iterable of `PokemonFacts`)."""
+    counts, ranges = _deltas(pokemon)
+    if not counts:
+        return
+    rows = []
+    for (dimension, member), count in counts.items():
+        low, high = ranges[int(member)] if dimension == "region" else (None, None)
+        rows.append(
+            {"dimension": dimension, "member": member, "count": count, "min_dex": low, "max_dex": high}
+        )
+    _upsert(rows)
+
+
+def _refresh_region_ranges(region_ids):
+    """Re-read the Pokédex range of regions from the (region_id, pokedex_number) index, in one UPDATE."""
+    numbers = select(Pokemon.pokedex_number).where(
+        Pokemon.region_id == cast(PokemonStat.member, Integer)
+    )
+    db.session.execute(
+        update(PokemonStat)
+        .where(
+            PokemonStat.dimension == "region",
+            PokemonStat.member.in_([str(region_id) for region_id in region_ids]),
+        )
+        .values(
+            min_dex=numbers.with_only_columns(func.min(Pokemon.pokedex_number)).scalar_subquery(),
+            max_dex=numbers.with_only_columns(func.max(Pokemon.pokedex_number)).scalar_subquery(),
+        ),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def record_deleted(pokemon):
+    """
+    Uncount deleted Pokémon (an iterable of `PokemonFacts`).
+
+    Two statements: an executemany decrement and the region range refresh.
+    Rows that reach zero are kept (and skipped by `load_stats`), so the
+    next insert for them is a plain update. Call after the Pokémon rows are
+    gone (flushed), so region ranges are re-read without them.
+    """
+    counts, ranges = _deltas(pokemon)
+    if not counts:
+        return
+    db.session.execute(
+        update(PokemonStat.__table__)
+        .where(
+            PokemonStat.dimension == bindparam("d"),
+            PokemonStat.member == bindparam("m"),
+        )
+        .values(count=PokemonStat.count - bindparam("n")),
+        [{"d": d, "m": m, "n": n} for (d, m), n in counts.items()],
+    )
+    _refresh_region_ranges(ranges)
+
+
+def facts_of(pokemon):
+    """`PokemonFacts` of a loaded `Pokemon` instance."""
+    return PokemonFacts(
+        pokemon.pokedex_number,
+        pokemon.region_id,
+        [t.id for t in pokemon.types],
+        pokemon.mythical_info.classification_id if pokemon.mythical_info else None,
+    )
+
+
+def pokemon_facts(ids):
+    """`PokemonFacts` of the Pokémon with the given ids, read with one query."""
+    facts = {}
+    for pokemon_id, number, region_id, classification_id, type_id in db.session.execute(
+        select(
+            Pokemon.id,
+            Pokemon.pokedex_number,
+            Pokemon.region_id,
+            MythicalPokemon.classification_id,
+            pokemon_type.c.type_id,
+        )
+        .outerjoin(MythicalPokemon, MythicalPokemon.pokemon_id == Pokemon.id)
+        .outerjoin(pokemon_type, pokemon_type.c.pokemon_id == Pokemon.id)
+        .where(Pokemon.id.in_(ids))
+    ):
+        if pokemon_id not in facts:
+            facts[pokemon_id] = PokemonFacts(number, region_id, [], classification_id)
+        if type_id is not None:
+            facts[pokemon_id].type_ids.append(type_id)
+    return list(facts.values())
+
+
+def rebuild_stats():
+    """
+    Recompute the whole summary from the Pokémon tables.
+
+    Runs a handful of GROUP BY queries and rewrites ``pokemon_stat``; the
+    caller commits. Returns the number of summary rows written.
+    """
+    rows = []
+
+    def add(dimension, member, count, low=None, high=None):
+        rows.append(
+            {"dimension": dimension, "member": str(member), "count": count, "min_dex": low, "max_dex": high}
+        )
+
+    total = db.session.scalar(select(func.count(Pokemon.id)))
+    if total:
+        add("total", "", total)
+
+    for region_id, count, low, high in db.session.execute(
+        select(
+            Pokemon.region_id,
+            func.count(Pokemon.id),
+            func.min(Pokemon.pokedex_number),
+            func.max(Pokemon.pokedex_number),
+        ).group_by(Pokemon.region_id)
+    ):
+        add("region", region_id, count, low, high)
+
+    classified = 0
+    for classification_id, count in db.session.execute(
+        select(MythicalPokemon.classification_id, func.count(MythicalPokemon.pokemon_id))
+        .group_by(MythicalPokemon.classification_id)
+    ):
+        add("classification", classification_id, count)
+        classified += count
+    if total - classified:
+        add("classification", UNCLASSIFIED, total - classified)
+
+    for type_id, count in db.session.execute(
+        select(pokemon_type.c.type_id, func.count(pokemon_type.c.pokemon_id))
+        .group_by(pokemon_type.c.type_id)
+    ):
+        add("type", type_id, count)
+
+    # A Pokémon has at most two types, so (min, max, count) identifies its combination.
+    per_pokemon = (
+        select(
+            func.min(pokemon_type.c.type_id).label("low"),
+            func.max(pokemon_type.c.type_id).label("high"),
+            func.count(pokemon_type.c.type_id).label("types"),
+        )
+        .group_by(pokemon_type.c.pokemon_id)
+        .subquery()
+    )
+    for low, high, types, count in db.session.execute(
+        select(per_pokemon.c.low, per_pokemon.c.high, per_pokemon.c.types, func.count())
+        .group_by(per_pokemon.c.low, per_pokemon.c.high, per_pokemon.c.types)
+    ):
+        add("type_pair", f"{low},{high}" if types > 1 else low, count)
+
+    db.session.execute(delete(PokemonStat))
+    if rows:
+        db.session.execute(insert(PokemonStat.__table__), rows)
+    return len(rows)
+
+
+def load_stats():
+    """
+    The ``GET /stats`` payload, read from the summary and the reference tables.
+
+    Region ``coverage`` is the share of Pokédex numbers between ``min_dex``
+    and ``max_dex`` that are taken.
+    """
+    names = {
+        "region": dict(db.session.execute(select(Region.id, Region.name)).all()),
+        "type": dict(db.session.execute(select(Type.id, Type.name)).all()),
+        "classification": dict(
+            db.session.execute(select(MythicalClassification.id, MythicalClassification.name)).all()
+        ),
+    }
+    payload = {"total": 0, "by_region": [], "by_type": [], "by_classification": [], "type_pairs": []}
+    for stat in db.session.scalars(
+        select(PokemonStat).where(PokemonStat.count > 0).order_by(PokemonStat.dimension, PokemonStat.member)
+    ):
+        if stat.dimension == "total":
+            payload["total"] = stat.count
+        elif stat.dimension == "region":
+            region_id = int(stat.member)
+            span = stat.max_dex - stat.min_dex + 1 if stat.min_dex is not None else 0
+            payload["by_region"].append({
+                "id": region_id,
+                "name": names["region"].get(region_id),
+                "count": stat.count,
+                "min_dex": stat.min_dex,
+                "max_dex": stat.max_dex,
+                "coverage": round(stat.count / span, 4) if span else 0,
+            })
+        elif stat.dimension == "type":
+            type_id = int(stat.member)
+            payload["by_type"].append(
+                {"id": type_id, "name": names["type"].get(type_id), "count": stat.count}
+            )
+        elif stat.dimension == "classification":
+            classification_id = None if stat.member == UNCLASSIFIED else int(stat.member)
+            payload["by_classification"].append({
+                "id": classification_id,
+                "name": names["classification"].get(classification_id),
+                "count": stat.count,
+            })
+        elif stat.dimension == "type_pair":
+            type_ids = [int(t) for t in stat.member.split(",")]
+            payload["type_pairs"].append({
+                "types": [{"id": t, "name": names["type"].get(t)} for t in type_ids],
+                "count": stat.count,
+            })
+    for key in ("by_region", "by_type", "by_classification"):
+        payload[key].sort(key=lambda entry: (entry["id"] is None, entry["id"] or 0))
+    payload["type_pairs"].sort(key=lambda entry: -entry["count"])
+    return payload
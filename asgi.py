@@ -0,0 +1,10 @@
+"""
+ASGI entry point: serves the app in asyncio mode (see app/asgi.py).
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+from app import create_app
+from app.asgi import create_asgi_app
+
+
+app = create_asgi_app(create_app())
@@ -0,0 +1,340 @@
+"""
+Load test: drive the API routes against a seeded SQLite database.
+
+Usage:
+    python -m benchmarks.api [--rows 1000] [--requests 200] [--threads 8]
+                             [--output benchmark-results.json] [--baseline old.json]
+
+Builds the app with `create_app` on a file-backed SQLite database seeded
+with `--rows` synthetic Pokémon, then
+
+* sends `--requests` sequential requests to every GET and POST route through
+  the Flask test client, recording latency percentiles, requests/sec and SQL
+  statements per request (including those run while a streamed body is
+  sent), and
+* runs a mixed GET workload from `--threads` threads calling the WSGI app
+  concurrently for the same number of requests per route.
+
+Results are written as sorted, indented JSON so runs from two commits can be
+diffed; with `--baseline` the change in p50 latency and requests/sec against
+an earlier result file is printed as well.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from app import create_app
+from app.bulk import insert_pokemon_batch
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Region, Type, MythicalClassification
+
+API_KEY = "benchmark-key"
+
+# SQL statements executed by the current thread, reset before each request.
+_statements = threading.local()
+
+
+def _count_statement(*args):
+    _statements.count = getattr(_statements, "count", 0) + 1
+
+
+def make_config(database_path, cache_enabled):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        DEBUG = False
+        TESTING = False
+        CACHE_ENABLED = cache_enabled
+        QUERY_COUNT_THRESHOLD = 0
+
+    return BenchmarkConfig
+
+
+def seed(rows, batch_size=1000):
+    """Insert reference data and `rows` synthetic Pokémon with the bulk insert path."""
+    regions = [Region(name=f"Region{i}") for i in range(9)]
+    types = [Type(name=f"Type{i}") for i in range(18)]
+    classifications = [MythicalClassification(name=f"Class{i}") for i in range(3)]
+    db.session.add_all(regions + types + classifications)
+    db.session.commit()
+
+    items = (
+        {
+            "name": f"Pokemon{i}",
+            "pokedex_number": i + 1,
+            "description": "A synthetic legendary Pokémon used for benchmarking. " * 3,
+            "region_id": regions[i % 9].id,
+            "type_ids": [types[i % 18].id, types[(i + 7) % 18].id],
+            "mythical": (
+                {"classification_id": classifications[i % 3].id} if i % 2 else None
+            ),
+        }
+        for i in range(rows)
+    )
+    while batch := list(itertools.islice(items, batch_size)):
+        insert_pokemon_batch(batch)
+        db.session.commit()
+
+
+# GET/POST endpoints deliberately left out of `routes`, with the reason.
+SKIPPED_ENDPOINTS = {
+    ("seed.seed", "POST"): "wipes the dataset the other routes read",
+    ("index", "GET"): "serves the static web form, not the API",
+    ("static", "GET"): "static files, not the API",
+}
+
+
+def routes(rows):
+    """
+    ``name -> (method, path factory, body factory)`` for every benchmarked route.
+
+    POST bodies use fresh names and Pokédex numbers so every write succeeds;
+    the bulk delete removes the Pokémon those writes created. Endpoints in
+    `SKIPPED_ENDPOINTS` are left out.
+    """
+    new_numbers = itertools.count(rows + 1)
+    lock = threading.Lock()
+
+    def next_number():
+        with lock:
+            return next(new_numbers)
+
+    def new_pokemon():
+        number = next_number()
+        return {
+            "name": f"Benchmark{number}",
+            "pokedex_number": number,
+            "region_id": 1,
+            "type_ids": [1, 2],
+        }
+
+    def ndjson_batch():
+        return "".join(json.dumps(new_pokemon()) + "\n" for _ in range(10))
+
+    def named(prefix):
+        return lambda: {"json": {"name": f"{prefix}{next_number()}"}}
+
+    def dex():
+        return random.randint(1, rows)
+
+    def static(path):
+        return lambda: path
+
+    return {
+        "GET /pokemon?page": ("GET", lambda: f"/api/v1/pokemon?page={random.randint(1, 5)}", None),
+        "GET /pokemon?cursor": ("GET", static("/api/v1/pokemon?cursor=&per_page=50"), None),
+        "GET /pokemon?fields": ("GET", static("/api/v1/pokemon?fields=name,pokedex_number"), None),
+        "GET /pokemon/<dex>": ("GET", lambda: f"/api/v1/pokemon/{dex()}", None),
+        "GET /pokemon/name/<name>": ("GET", lambda: f"/api/v1/pokemon/name/Pokemon{dex() - 1}", None),
+        "GET /pokemon/random": ("GET", static("/api/v1/pokemon/random"), None),
+        "GET /pokemon/type/<type>": ("GET", lambda: f"/api/v1/pokemon/type/Type{random.randint(0, 17)}", None),
+        "GET /pokemon/legendary": ("GET", static("/api/v1/pokemon/legendary"), None),
+        "GET /pokemon/singular": ("GET", static("/api/v1/pokemon/singular"), None),
+        "GET /pokemon/search": ("GET", static("/api/v1/pokemon/search?type=Type1&region=Region1"), None),
+        "GET /pokemon/export": ("GET", static("/api/v1/pokemon/export"), None),
+        "GET /regions": ("GET", static("/api/v1/regions"), None),
+        "GET /types": ("GET", static("/api/v1/types"), None),
+        "GET /mythical-classifications": ("GET", static("/api/v1/mythical-classifications"), None),
+        "GET /pokemon/batch": (
+            "GET", lambda: f"/api/v1/pokemon/batch?dex={dex()},{dex()}&name=Pokemon{dex() - 1}", None
+        ),
+        "GET /pokemon/changes": ("GET", static("/api/v1/pokemon/changes?limit=100"), None),
+        "GET /stats": ("GET", static("/api/v1/stats"), None),
+        "GET /health": ("GET", static("/api/v1/health"), None),
+        "GET /metrics": ("GET", static("/api/v1/metrics"), None),
+        "POST /pokemon": ("POST", static("/api/v1/pokemon"), lambda: {"json": new_pokemon()}),
+        "POST /pokemon (batch)": (
+            "POST", static("/api/v1/pokemon"), lambda: {"json": [new_pokemon() for _ in range(10)]}
+        ),
+        "POST /pokemon/import": (
+            "POST", static("/api/v1/pokemon/import"), lambda: {"data": ndjson_batch()}
+        ),
+        "POST /regions": ("POST", static("/api/v1/regions"), named("Region")),
+        "POST /types": ("POST", static("/api/v1/types"), named("Type")),
+        "POST /mythical-classifications": (
+            "POST", static("/api/v1/mythical-classifications"), named("Class")
+        ),
+        "POST /pokemon/bulk-delete": (
+            "POST", static("/api/v1/pokemon/bulk-delete"), lambda: {"json": {"filter": {"name": "Benchmark"}}}
+        ),
+    }
+
+
+def route_endpoints(app, route_table):
+    """``(endpoint, method)`` pairs the route table exercises, resolved through the app's url map."""
+    adapter = app.url_map.bind("localhost")
+    return {
+        (adapter.match(path().partition("?")[0], method=method)[0], method)
+        for method, path, _ in route_table.values()
+    }
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, queries, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+    }
+
+
+def send(client, route):
+    """Send one request; returns ``(seconds, sql statements)``."""
+    method, path, body = route
+    _statements.count = 0
+    started = time.perf_counter()
+    response = client.open(
+        path(), method=method, headers={"X-API-Key": API_KEY}, **(body() if body else {})
+    )
+    response.get_data()  # drain streamed bodies
+    elapsed = time.perf_counter() - started
+    if response.status_code >= 400:
+        raise RuntimeError(f"{method} {response.request.path} -> {response.status_code}")
+    return elapsed, _statements.count
+
+
+def run_sequential(app, route_table, requests):
+    results = {}
+    client = app.test_client()
+    for name, route in route_table.items():
+        send(client, route)  # warm up
+        started = time.perf_counter()
+        samples = [send(client, route) for _ in range(requests)]
+        elapsed = time.perf_counter() - started
+        results[name] = summarize(
+            [s for s, _ in samples], [q for _, q in samples], elapsed
+        )
+    return results
+
+
+def run_concurrent(app, route_table, requests, threads):
+    """Mixed GET workload issued from `threads` threads, one test client each."""
+    get_routes = [route for route in route_table.values() if route[0] == "GET"]
+    local = threading.local()
+
+    def worker(route):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        return send(local.client, route)
+
+    work = get_routes * requests
+    random.shuffle(work)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = list(pool.map(worker, work))
+    elapsed = time.perf_counter() - started
+    result = summarize([s for s, _ in samples], [q for _, q in samples], elapsed)
+    result["threads"] = threads
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(rows, requests, threads, database_path, cache_enabled=True):
+    """Seed a fresh database, run both workloads and return the result document."""
+    os.environ["API_KEY"] = API_KEY
+    random.seed(0)
+    app = create_app(make_config(database_path, cache_enabled))
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed(rows)
+        engine = db.engine
+    route_table = routes(rows)
+    # Count only this app's statements, and only while the benchmark runs.
+    event.listen(engine, "before_cursor_execute", _count_statement)
+    try:
+        return {
+            "meta": {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "json_provider": type(app.json).__name__,
+                "rows": rows,
+                "requests_per_route": requests,
+                "cache_enabled": cache_enabled,
+            },
+            "routes": run_sequential(app, route_table, requests),
+            "concurrent": run_concurrent(app, route_table, requests, threads),
+        }
+    finally:
+        event.remove(engine, "before_cursor_execute", _count_statement)
+
+
+def print_report(result, baseline=None):
+    print(f"{'route':32} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'SQL/req':>8}")
+    rows = dict(result["routes"], **{"concurrent GET mix": result["concurrent"]})
+    old = dict(baseline["routes"], **{"concurrent GET mix": baseline["concurrent"]}) if baseline else {}
+    for name, r in rows.items():
+        line = (
+            f"{name:32} {r['requests_per_second']:9.1f} {r['p50_ms']:9.3f} "
+            f"{r['p95_ms']:9.3f} {r['p99_ms']:9.3f} {r['queries_per_request']:8.2f}"
+        )
+        if name in old:
+            line += (
+                f"  p50 {(r['p50_ms'] / old[name]['p50_ms'] - 1) * 100:+6.1f}%"
+                f"  req/s {(r['requests_per_second'] / old[name]['requests_per_second'] - 1) * 100:+6.1f}%"
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--no-cache", action="store_true", help="run with CACHE_ENABLED=False")
+    parser.add_argument("--database", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run_benchmark(
+            args.rows,
+            args.requests,
+            args.threads,
+            args.database or os.path.join(tmp, "benchmark.sqlite"),
+            cache_enabled=not args.no_cache,
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    print_report(result, baseline)
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
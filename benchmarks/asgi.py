@@ -0,0 +1,187 @@
+"""
+Throughput comparison: WSGI (threaded) vs ASGI (asyncio) serving modes.
+
+Usage:
+    python -m benchmarks.asgi [--rows 1000] [--requests 2000] [--concurrency 10,100,300]
+                              [--database-url mysql+pymysql://...] [--output asgi-results.json]
+
+Seeds a database (a temporary SQLite file unless `--database-url` is given),
+then serves the same app twice on localhost - through Werkzeug's threaded
+WSGI server (one thread per connection, like gunicorn's gthread workers) and
+through uvicorn with `app.asgi` - and drives both with `--concurrency`
+HTTP clients on an asyncio loop in a separate process, one connection per
+request since the Werkzeug server does not keep connections alive. A mix of list, Pokédex
+number and name lookups is requested, with the read-through cache disabled
+so every request reaches the database.
+
+SQLite answers in microseconds, so the comparison mostly measures framework
+overhead; point `--database-url` at MySQL to see the effect of waiting on
+database I/O.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+
+import uvicorn
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from app.asgi import create_asgi_app
+from app.config import TestingConfig
+from app.extensions import db
+from benchmarks.api import percentile, seed
+
+
+def make_config(database_url):
+    class ComparisonConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        TESTING = False
+        CACHE_ENABLED = False
+        METRICS_ENABLED = False
+
+    return ComparisonConfig
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def serve_wsgi(app):
+    server = make_server(
+        "127.0.0.1", free_port(), app, threaded=True, request_handler=QuietRequestHandler
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def serve_asgi(app):
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    def stop():
+        server.should_exit = True
+        thread.join()
+
+    return port, stop
+
+
+async def fetch(port, path):
+    """One request on its own connection; returns the status code."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def drive(port, paths, concurrency):
+    """Send every path from `concurrency` concurrent clients; returns (latencies, seconds)."""
+    queue = list(reversed(paths))
+    latencies = []
+
+    async def client():
+        while queue:
+            path = queue.pop()
+            started = time.perf_counter()
+            status = await fetch(port, path)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                raise RuntimeError(f"GET {path} -> {status}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def run_clients(port, paths, concurrency):
+    """Entry point of the client process, kept apart from the servers' GIL."""
+    return asyncio.run(drive(port, paths, concurrency))
+
+
+def workload(rows, requests):
+    random.seed(0)
+    makers = [
+        lambda: f"/api/v1/pokemon?page={random.randint(1, 5)}",
+        lambda: f"/api/v1/pokemon/{random.randint(1, rows)}",
+        lambda: f"/api/v1/pokemon/name/Pokemon{random.randint(0, rows - 1)}",
+    ]
+    return [random.choice(makers)() for _ in range(requests)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="10,100,300")
+    parser.add_argument("--database-url", help="sync SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--output", default="asgi-results.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'comparison.sqlite')}"
+        flask_app = create_app(make_config(url))
+        with flask_app.app_context():
+            db.drop_all()
+            db.create_all()
+            seed(args.rows)
+
+        paths = workload(args.rows, args.requests)
+        clients = multiprocessing.get_context("spawn").Pool(1)
+        results = {"meta": {"rows": args.rows, "requests": args.requests, "database": url.split(":")[0]}}
+        for mode, serve in (("wsgi", serve_wsgi), ("asgi", serve_asgi)):
+            app = flask_app if mode == "wsgi" else create_asgi_app(flask_app)
+            port, stop = serve(app)
+            clients.apply(run_clients, (port, paths[:50], 5))  # warm up
+            results[mode] = {}
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                latencies, seconds = clients.apply(run_clients, (port, paths, concurrency))
+                latencies.sort()
+                results[mode][str(concurrency)] = {
+                    "requests_per_second": round(len(latencies) / seconds, 1),
+                    "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                    "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+                }
+            stop()
+        clients.close()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    print(f"{'concurrency':>11} {'mode':>5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in results["wsgi"]:
+        for mode in ("wsgi", "asgi"):
+            r = results[mode][concurrency]
+            print(
+                f"{concurrency:>11} {mode:>5} {r['requests_per_second']:9.1f} "
+                f"{r['p50_ms']:9.3f} {r['p99_ms']:9.3f}"
+            )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Microbenchmark: ORM serialize_pokemon + stdlib jsonify vs the row-tuple pipeline.
+
+Usage:
+    python -m benchmarks.serialization [--rows 2000] [--page-size 100] [--repeat 200]
+
+Runs against an in-memory SQLite database seeded with synthetic Pokémon and
+prints the mean time per page for query+serialize+encode and for
+serialize+encode alone.
+"""
+import argparse
+import timeit
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.api.routes.pokemon import serialize_pokemon
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Pokemon, Region, Type, MythicalClassification, MythicalPokemon
+from app.queries import pokemon_list_query, pokemon_query
+from app.serializers import load_types, serialize_pokemon_row, serialize_pokemon_rows
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    DEBUG = False
+
+
+def seed(rows):
+    regions = [Region(name=f"Region{i}") for i in range(9)]
+    types = [Type(name=f"Type{i}") for i in range(18)]
+    classifications = [MythicalClassification(name=f"Class{i}") for i in range(3)]
+    db.session.add_all(regions + types + classifications)
+    db.session.flush()
+    for i in range(rows):
+        pokemon = Pokemon(
+            name=f"Pokemon{i}",
+            pokedex_number=i + 1,
+            description="A synthetic legendary Pokémon used for benchmarking. " * 3,
+            region_id=regions[i % 9].id,
+        )
+        pokemon.types = [types[i % 18], types[(i + 7) % 18]]
+        db.session.add(pokemon)
+        db.session.flush()
+        if i % 2:
+            db.session.add(
+                MythicalPokemon(pokemon_id=pokemon.id, classification_id=classifications[i % 3].id)
+            )
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    stdlib_json = DefaultJSONProvider(app)
+
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+
+        def orm_page():
+            db.session.expunge_all()
+            return pokemon_query().order_by(Pokemon.pokedex_number).limit(args.page_size).all()
+
+        def row_page():
+            return pokemon_list_query().limit(args.page_size).all()
+
+        orm_objects = orm_page()
+        rows = row_page()
+        types = load_types([row.id for row in rows])
+
+        cases = {
+            "baseline: ORM query + serialize_pokemon + stdlib jsonify": lambda: stdlib_json.response(
+                [serialize_pokemon(p) for p in orm_page()]
+            ),
+            "pipeline: row query + serialize_pokemon_rows + app.json": lambda: app.json.response(
+                serialize_pokemon_rows(row_page())
+            ),
+            "baseline: serialize_pokemon + stdlib jsonify (preloaded)": lambda: stdlib_json.response(
+                [serialize_pokemon(p) for p in orm_objects]
+            ),
+            "pipeline: serialize_pokemon_row + app.json (preloaded rows)": lambda: app.json.response(
+                [serialize_pokemon_row(row, types[row.id]) for row in rows]
+            ),
+        }
+
+        print(f"{args.rows} rows, page size {args.page_size}, JSON provider {type(app.json).__name__}")
+        for name, fn in cases.items():
+            fn()
+            seconds = timeit.timeit(fn, number=args.repeat) / args.repeat
+            print(f"{seconds * 1000:9.3f} ms/page  {name}")
+
+
+if __name__ == "__main__":
+    main()
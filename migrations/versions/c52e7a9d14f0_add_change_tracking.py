@@ -0,0 +1,52 @@
+"""add change tracking
+
+Revision ID: c52e7a9d14f0
+Revises: bb1025d7cbb6
+Create Date: 2026-10-18 16:42:05.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e7a9d14f0'
+down_revision = 'bb1025d7cbb6'
+branch_labels = None
+depends_on = None
+
+precise_datetime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def upgrade():
+    with op.batch_alter_table('pokemon', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', precise_datetime, nullable=True))
+
+    # Existing rows count as changed when they were created.
+    op.execute("UPDATE pokemon SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+
+    with op.batch_alter_table('pokemon', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=precise_datetime, nullable=False)
+        batch_op.create_index('ix_pokemon_updated_at_id', ['updated_at', 'id'], unique=False)
+
+    op.create_table('pokemon_tombstone',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('pokemon_id', sa.Integer(), nullable=False),
+    sa.Column('pokedex_number', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('deleted_at', precise_datetime, nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('pokemon_tombstone', schema=None) as batch_op:
+        batch_op.create_index('ix_pokemon_tombstone_deleted_at_id', ['deleted_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('pokemon_tombstone', schema=None) as batch_op:
+        batch_op.drop_index('ix_pokemon_tombstone_deleted_at_id')
+
+    op.drop_table('pokemon_tombstone')
+    with op.batch_alter_table('pokemon', schema=None) as batch_op:
+        batch_op.drop_index('ix_pokemon_updated_at_id')
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,83 @@
+"""add pokemon stat summary
+
+Revision ID: d7f3b18e60a2
+Revises: c52e7a9d14f0
+Create Date: 2026-10-18 17:20:44.902615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f3b18e60a2'
+down_revision = 'c52e7a9d14f0'
+branch_labels = None
+depends_on = None
+
+
+def _fill_summary():
+    """Fill pokemon_stat from existing rows with the GROUP BYs of app.stats.rebuild_stats."""
+    pokemon = sa.table('pokemon', sa.column('id'), sa.column('pokedex_number'), sa.column('region_id'))
+    pokemon_type = sa.table('pokemon_type', sa.column('pokemon_id'), sa.column('type_id'))
+    mythical = sa.table('mythical_pokemon', sa.column('pokemon_id'), sa.column('classification_id'))
+    stat = sa.table(
+        'pokemon_stat',
+        sa.column('dimension'), sa.column('member'), sa.column('count'),
+        sa.column('min_dex'), sa.column('max_dex'),
+    )
+    columns = ['dimension', 'member', 'count', 'min_dex', 'max_dex']
+    none = sa.null()
+
+    def text(column):
+        return sa.cast(column, sa.String)
+
+    per_pokemon = (
+        sa.select(
+            sa.func.min(pokemon_type.c.type_id).label('low'),
+            sa.func.max(pokemon_type.c.type_id).label('high'),
+            sa.func.count().label('types'),
+        )
+        .group_by(pokemon_type.c.pokemon_id)
+        .subquery()
+    )
+    pair = sa.case(
+        (per_pokemon.c.types > 1, text(per_pokemon.c.low) + ',' + text(per_pokemon.c.high)),
+        else_=text(per_pokemon.c.low),
+    )
+    for select in (
+        sa.select(sa.literal('total'), sa.literal(''), sa.func.count(), none, none).select_from(pokemon),
+        sa.select(
+            sa.literal('region'), text(pokemon.c.region_id), sa.func.count(),
+            sa.func.min(pokemon.c.pokedex_number), sa.func.max(pokemon.c.pokedex_number),
+        ).group_by(pokemon.c.region_id),
+        sa.select(
+            sa.literal('classification'), text(mythical.c.classification_id), sa.func.count(), none, none,
+        ).group_by(mythical.c.classification_id),
+        sa.select(sa.literal('classification'), sa.literal('none'), sa.func.count(), none, none)
+        .select_from(pokemon.outerjoin(mythical, mythical.c.pokemon_id == pokemon.c.id))
+        .where(mythical.c.pokemon_id.is_(None)),
+        sa.select(sa.literal('type'), text(pokemon_type.c.type_id), sa.func.count(), none, none)
+        .group_by(pokemon_type.c.type_id),
+        sa.select(sa.literal('type_pair'), pair, sa.func.count(), none, none)
+        .group_by(per_pokemon.c.low, per_pokemon.c.high, per_pokemon.c.types),
+    ):
+        op.execute(stat.insert().from_select(columns, select))
+    # The ungrouped counts produce a row even for an empty table.
+    op.execute(stat.delete().where(stat.c.count == 0))
+
+
+def upgrade():
+    op.create_table('pokemon_stat',
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('member', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('min_dex', sa.Integer(), nullable=True),
+    sa.Column('max_dex', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('dimension', 'member')
+    )
+    _fill_summary()
+
+
+def downgrade():
+    op.drop_table('pokemon_stat')
@@ -0,0 +1,1006 @@
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Pokemon, Region, Type, MythicalClassification, MythicalPokemon
+from app.stats import load_stats, rebuild_stats
+
+
+class SQLiteTestingConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
+@pytest.fixture
+def app():
+    app = create_app(SQLiteTestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def seed_pokemon(count):
+    """Insert `count` Pokémon spread over two regions, types and classifications."""
+    regions = [Region(name="Kanto"), Region(name="Johto")]
+    types = [Type(name="Psychic"), Type(name="Flying"), Type(name="Fire")]
+    classifications = [
+        MythicalClassification(name="Legendary"),
+        MythicalClassification(name="Singular"),
+    ]
+    db.session.add_all(regions + types + classifications)
+    db.session.flush()
+
+    for i in range(count):
+        pokemon = Pokemon(
+            name=f"Pokemon{i}",
+            pokedex_number=i + 1,
+            description=f"Synthetic Pokémon #{i + 1}",
+            region_id=regions[i % 2].id,
+        )
+        pokemon.types = [types[i % 3], types[(i + 1) % 3]]
+        db.session.add(pokemon)
+        db.session.flush()
+        db.session.add(
+            MythicalPokemon(
+                pokemon_id=pokemon.id,
+                classification_id=classifications[i % 2].id,
+            )
+        )
+    rebuild_stats()
+    db.session.commit()
+    db.session.expunge_all()
+
+
+class StatementCounter:
+    """Count SQL statements sent to the engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/pokemon",
+        "/api/v1/pokemon/legendary",
+        "/api/v1/pokemon/singular",
+        "/api/v1/pokemon/type/Psychic",
+        "/api/v1/pokemon/1",
+        "/api/v1/pokemon/name/Pokemon0",
+        "/api/v1/pokemon/random",
+    ],
+)
+def test_pokemon_endpoints_use_fixed_statement_count(app, client, path):
+    counts = []
+    for size in (3, 30):
+        db.drop_all()
+        db.create_all()
+        seed_pokemon(size)
+        with StatementCounter(db.engine) as counter:
+            response = client.get(path)
+        assert response.status_code == 200
+        counts.append(counter.count)
+
+    assert counts[0] == counts[1]
+    assert counts[0] <= 3
+
+
+def test_serialized_pokemon_includes_relationships(app, client):
+    seed_pokemon(2)
+    data = client.get("/api/v1/pokemon/1").get_json()
+
+    assert data["region"]["name"] == "Kanto"
+    assert [t["name"] for t in data["types"]] == ["Psychic", "Flying"]
+    assert data["mythical_info"] == {"classification": "Legendary"}
+
+
+def test_cursor_pagination_walks_whole_dex(app, client):
+    seed_pokemon(7)
+    seen = []
+    cursor = ""
+    while True:
+        data = client.get(f"/api/v1/pokemon?per_page=3&cursor={cursor}").get_json()
+        seen.extend(p["pokedex_number"] for p in data["data"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == list(range(1, 8))
+
+
+def test_cursor_pagination_skips_count_query(app, client):
+    seed_pokemon(5)
+    with StatementCounter(db.engine) as counter:
+        client.get("/api/v1/pokemon/legendary?cursor=")
+    assert counter.count == 2
+
+
+def test_invalid_cursor_is_rejected(app, client):
+    response = client.get("/api/v1/pokemon?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_page_pagination_honours_per_page_limit(app, client):
+    app.config["POKEMON_MAX_PER_PAGE"] = 4
+    seed_pokemon(10)
+
+    assert len(client.get("/api/v1/pokemon?per_page=50").get_json()) == 4
+    page_two = client.get("/api/v1/pokemon?page=2&per_page=3").get_json()
+    assert [p["pokedex_number"] for p in page_two] == [4, 5, 6]
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    monkeypatch.setenv("API_KEY", "test-key")
+    return {"X-API-Key": "test-key"}
+
+
+def test_reference_data_is_served_from_cache(app, client, api_key):
+    seed_pokemon(1)
+    assert len(client.get("/api/v1/regions").get_json()) == 2
+
+    with StatementCounter(db.engine) as counter:
+        assert len(client.get("/api/v1/regions").get_json()) == 2
+    assert counter.count == 0
+
+    client.post("/api/v1/regions", json={"name": "Hoenn"}, headers=api_key)
+    assert len(client.get("/api/v1/regions").get_json()) == 3
+
+    stats = client.get("/api/v1/health").get_json()["cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_pokemon_payload_cache_invalidated_on_delete(app, client, api_key):
+    seed_pokemon(3)
+    assert client.get("/api/v1/pokemon/2").status_code == 200
+
+    pokemon_id = Pokemon.query.filter_by(pokedex_number=2).one().id
+    client.delete(f"/api/v1/pokemon/{pokemon_id}", headers=api_key)
+
+    assert client.get("/api/v1/pokemon/2").status_code == 404
+    assert len(client.get("/api/v1/pokemon").get_json()) == 2
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries():
+    from app.cache import Cache
+
+    cache = Cache()
+    cache.backend.max_entries = 2
+    cache.get_or_set("a", lambda: 1, ("t",))
+    cache.get_or_set("b", lambda: 2, ("t",))
+    cache.get_or_set("a", lambda: None, ("t",))
+    cache.get_or_set("c", lambda: 3, ("t",))
+
+    assert cache.get_or_set("a", lambda: "reloaded", ("t",)) == 1
+    assert cache.get_or_set("b", lambda: "reloaded", ("t",)) == "reloaded"
+
+    cache.ttl = -1
+    cache.get_or_set("d", lambda: 4, ("t",))
+    assert cache.get_or_set("d", lambda: "expired", ("t",)) == "expired"
+
+
+def test_file_backend_shares_entries_and_invalidation_between_workers(tmp_path):
+    import os
+
+    from flask import Flask
+
+    from app.cache import Cache, FileBackend
+
+    config = {"CACHE_DIR": str(tmp_path), "CACHE_MAX_ENTRIES": 8}
+    worker_a, worker_b = Cache(), Cache()
+    worker_a.backend = FileBackend(config)
+    worker_b.backend = FileBackend(config)
+
+    worker_a.get_or_set("regions", lambda: ["Kanto"], ("region",))
+    assert worker_b.get_or_set("regions", lambda: ["stale"], ("region",)) == ["Kanto"]
+
+    worker_a.bump("region")
+    assert worker_b.get_or_set("regions", lambda: ["Kanto", "Johto"], ("region",)) == [
+        "Kanto",
+        "Johto",
+    ]
+
+    # A recent entry is not touched on a hit, so reads do not write to the volume.
+    path = worker_a.backend._entry_path("regions")
+    os.utime(path, (1000, 1000))
+    worker_b.backend.TOUCH_INTERVAL = float("inf")
+    worker_b.get_or_set("regions", lambda: ["stale"], ("region",))
+    assert os.path.getmtime(path) == 1000
+
+    # Starting another worker (or a CLI command) keeps the shared entries.
+    restarted_app = Flask(__name__)
+    restarted_app.config.update(config, CACHE_BACKEND="file")
+    restarted = Cache()
+    restarted.init_app(restarted_app)
+    assert restarted.get_or_set("regions", lambda: ["flushed"], ("region",)) == ["Kanto", "Johto"]
+
+
+def test_if_none_match_returns_304_without_queries(app, client):
+    seed_pokemon(3)
+    response = client.get("/api/v1/pokemon")
+    etag = response.headers["ETag"]
+    assert response.cache_control.max_age == 60
+
+    with StatementCounter(db.engine) as counter:
+        response = client.get("/api/v1/pokemon", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert counter.count == 0
+
+
+def test_etag_changes_after_write(app, client, api_key):
+    response = client.get("/api/v1/types")
+    etag = response.headers["ETag"]
+    assert response.cache_control.max_age == 3600
+
+    client.post("/api/v1/types", json={"name": "Dragon"}, headers=api_key)
+
+    response = client.get("/api/v1/types", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_random_pokemon_is_not_cacheable(app, client):
+    seed_pokemon(2)
+    response = client.get("/api/v1/pokemon/random")
+    assert response.cache_control.no_store
+    assert "ETag" not in response.headers
+
+
+def test_bulk_create_uses_set_based_statements(app, client, api_key):
+    seed_pokemon(1)
+    batch = [
+        {
+            "name": f"Bulk{i}",
+            "pokedex_number": 100 + i,
+            "region_id": 1,
+            "type_ids": [1, 2],
+            "mythical": {"classification_id": 2},
+        }
+        for i in range(50)
+    ]
+    batch += [
+        {"name": "Pokemon0", "pokedex_number": 999, "region_id": 1, "type_ids": [1]},
+        {"name": "Bulk0", "pokedex_number": 998, "region_id": 1, "type_ids": [1]},
+        # Equal to Bulk1 under MySQL's case- and accent-insensitive collation.
+        {"name": "bülk1", "pokedex_number": 993, "region_id": 1, "type_ids": [1]},
+        {"name": "NoRegion", "pokedex_number": 997, "region_id": 42, "type_ids": [1]},
+        {"name": "BadType", "pokedex_number": 996, "region_id": 1, "type_ids": [77]},
+        {"name": "NoTypes", "pokedex_number": 995, "region_id": 1, "type_ids": []},
+        {
+            "name": "BadClass",
+            "pokedex_number": 994,
+            "region_id": 1,
+            "type_ids": [1],
+            "mythical": {"classification_id": 9},
+        },
+        {"name": "Missing"},
+    ]
+
+    with StatementCounter(db.engine) as counter:
+        response = client.post("/api/v1/pokemon", json=batch, headers=api_key)
+    data = response.get_json()
+
+    assert response.status_code == 201
+    assert data["total_created"] == 50
+    assert data["errors"] == [
+        'Pokemon0: Pokemon "Pokemon0" already exists',
+        'Bulk0: Pokemon "Bulk0" already exists',
+        'bülk1: Pokemon "bülk1" already exists',
+        "NoRegion: Region with id 42 not found",
+        "BadType: One or more type_ids not found",
+        "NoTypes: A Pokémon must have at least 1 type",
+        "BadClass: Mythical classification not found",
+        "Missing: Missing required fields: ['pokedex_number', 'region_id', 'type_ids']",
+    ]
+    assert counter.count <= 12
+
+    created = client.get("/api/v1/pokemon/149").get_json()
+    assert [t["id"] for t in created["types"]] == [1, 2]
+    assert created["mythical_info"] == {"classification": "Singular"}
+    assert created["created_at"] is not None
+
+
+def test_export_streams_ndjson(app, client):
+    import json
+
+    app.config["EXPORT_BATCH_SIZE"] = 4
+    seed_pokemon(10)
+
+    response = client.get("/api/v1/pokemon/export")
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [r["pokedex_number"] for r in rows] == list(range(1, 11))
+    assert rows[0]["types"] == [{"id": 1, "name": "Psychic"}, {"id": 2, "name": "Flying"}]
+
+
+def test_export_streams_csv(app, client):
+    import csv
+
+    seed_pokemon(3)
+    response = client.get("/api/v1/pokemon/export?format=csv")
+    rows = list(csv.reader(response.get_data(as_text=True).splitlines()))
+
+    assert rows[0][:3] == ["id", "name", "pokedex_number"]
+    assert rows[1][5:8] == ["Kanto", "Psychic/Flying", "Legendary"]
+    assert len(rows) == 4
+    assert client.get("/api/v1/pokemon/export?format=xml").status_code == 400
+
+
+def test_ndjson_import_commits_in_chunks(app, client, api_key):
+    import json
+
+    seed_pokemon(1)
+    lines = [
+        json.dumps({"name": f"Imported{i}", "pokedex_number": 200 + i, "region_id": 2, "type_ids": [3]})
+        for i in range(5)
+    ]
+    lines.insert(2, "{not json")
+    lines.append(json.dumps({"name": "Pokemon0", "pokedex_number": 1, "region_id": 1, "type_ids": [1]}))
+
+    response = client.post(
+        "/api/v1/pokemon/import?chunk_size=2",
+        data="\n".join(lines),
+        headers={**api_key, "Content-Type": "application/x-ndjson"},
+    )
+    reports = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.status_code == 200
+    assert [r["lines"] for r in reports[:-1]] == [[1, 2], [3, 5], [6, 7]]
+    assert reports[1]["errors"] == ["line 3: invalid JSON"]
+    assert reports[2]["errors"] == ['Pokemon0: Pokemon "Pokemon0" already exists']
+    assert reports[-1] == {"done": True, "total_created": 5, "total_errors": 2}
+    assert Pokemon.query.count() == 6
+
+
+def test_ndjson_import_requires_api_key(app, client, api_key):
+    assert client.post("/api/v1/pokemon/import", data="").status_code == 401
+
+
+def test_pokedex_index_serves_lookups_from_memory(app, client, api_key):
+    app.config["POKEDEX_INDEX_ENABLED"] = True
+    from app.extensions import pokedex_index
+
+    pokedex_index.init_app(app)
+    seed_pokemon(6)
+    expected = client.get("/api/v1/pokemon/3").get_json()
+    app.extensions["cache"].clear()
+
+    with StatementCounter(db.engine) as counter:
+        assert client.get("/api/v1/pokemon/3").get_json() == expected
+        assert client.get("/api/v1/pokemon/name/pokemon2").get_json() == expected
+        by_type = client.get("/api/v1/pokemon/type/fire").get_json()
+        assert client.get("/api/v1/pokemon/404").status_code == 404
+        assert client.get("/api/v1/pokemon/type/Dark").status_code == 404
+    assert counter.count == 0
+    assert [p["pokedex_number"] for p in by_type] == [2, 3, 5, 6]
+
+    client.delete(f"/api/v1/pokemon/{expected['id']}", headers=api_key)
+    assert client.get("/api/v1/pokemon/3").status_code == 404
+
+    stats = client.get("/api/v1/health").get_json()["pokedex_index"]
+    assert stats["records"] == 5
+    assert stats["memory_bytes"] > 0
+
+
+def test_name_and_type_lookups_match_the_same_way_with_and_without_the_index(app, client):
+    from app.extensions import pokedex_index
+
+    seed_pokemon(3)
+    paths = (
+        "/api/v1/pokemon/name/POKEMON1",
+        "/api/v1/pokemon/name/pok%C3%A9mon1",
+        "/api/v1/pokemon/name/Pokemon",
+        "/api/v1/pokemon/batch?name=pokemon0,P%C3%B3kemon2,Pokemon9&fields=name",
+        "/api/v1/pokemon/type/fire?fields=name",
+        "/api/v1/pokemon/type/Dark",
+    )
+    app.config["CACHE_ENABLED"] = False
+    for enabled in (False, True):
+        app.config["POKEDEX_INDEX_ENABLED"] = enabled
+        pokedex_index.init_app(app)
+        responses = [client.get(path) for path in paths]
+        assert responses[0].get_json()["name"] == "Pokemon1"
+        assert responses[1].get_json() == responses[0].get_json()
+        assert responses[2].status_code == 404
+        assert responses[3].get_json() == [
+            {"name": "pokemon0", "pokemon": {"name": "Pokemon0"}},
+            {"name": "Pókemon2", "pokemon": {"name": "Pokemon2"}},
+            {"name": "Pokemon9", "pokemon": None},
+        ]
+        assert responses[4].get_json() == [{"name": "Pokemon1"}, {"name": "Pokemon2"}]
+        assert responses[5].status_code == 404
+
+
+def test_search_combines_filters_in_one_query(app, client):
+    seed_pokemon(12)
+
+    with StatementCounter(db.engine) as counter:
+        data = client.get(
+            "/api/v1/pokemon/search?type=Psychic,Flying&region=Kanto"
+            "&classification=Legendary&dex_min=2&dex_max=12&name=Pokemon"
+        ).get_json()
+    assert counter.count == 2
+    assert [p["pokedex_number"] for p in data] == [7]
+
+    by_ids = client.get("/api/v1/pokemon/search?type=3&region=2").get_json()
+    assert [p["pokedex_number"] for p in by_ids] == [2, 6, 8, 12]
+
+    prefix = client.get("/api/v1/pokemon/search?name=Pokemon1&per_page=50").get_json()
+    assert [p["name"] for p in prefix] == ["Pokemon1", "Pokemon10", "Pokemon11"]
+
+    assert client.get("/api/v1/pokemon/search?dex_min=abc").status_code == 400
+
+    # "²" is a digit to str.isdigit() but not a number to int(); treat it as a name.
+    superscript = client.get("/api/v1/pokemon/search?region=%C2%B2")
+    assert superscript.status_code == 200 and superscript.get_json() == []
+    assert client.get("/api/v1/pokemon/random?type=%C2%B2").status_code == 404
+    assert client.get("/api/v1/pokemon/batch?dex=%C2%B2").status_code == 400
+
+
+def test_random_pokemon_costs_one_lookup_and_honours_filters(app, client):
+    seed_pokemon(10)
+    client.get("/api/v1/pokemon/random")
+
+    app.extensions["cache"].enabled = False  # the id list does not depend on the cache
+    with StatementCounter(db.engine) as counter:
+        data = client.get("/api/v1/pokemon/random").get_json()
+    assert counter.count <= 2
+    assert 1 <= data["pokedex_number"] <= 10
+    app.extensions["cache"].enabled = True
+
+    many = client.get("/api/v1/pokemon/random?count=4&region=Johto").get_json()
+    assert len(many) == 4
+    assert len({p["id"] for p in many}) == 4
+    assert all(p["region"]["name"] == "Johto" for p in many)
+
+    capped = client.get("/api/v1/pokemon/random?count=50&classification=Singular").get_json()
+    assert sorted(p["pokedex_number"] for p in capped) == [2, 4, 6, 8, 10]
+
+    assert client.get("/api/v1/pokemon/random?region=Hoenn").status_code == 404
+    assert client.get("/api/v1/pokemon/random?count=0").status_code == 400
+
+
+def test_row_serializer_matches_orm_serializer(app):
+    from app.api.routes.pokemon import serialize_pokemon
+    from app.queries import pokemon_list_query, pokemon_query
+    from app.serializers import serialize_pokemon_rows
+
+    seed_pokemon(6)
+    orm_payloads = [
+        serialize_pokemon(p)
+        for p in pokemon_query().order_by(Pokemon.pokedex_number).all()
+    ]
+    for payload in orm_payloads:
+        payload["types"].sort(key=lambda t: t["id"])
+
+    assert serialize_pokemon_rows(pokemon_list_query().all()) == orm_payloads
+
+
+@pytest.mark.parametrize("provider", ["auto", "stdlib"])
+def test_json_providers_produce_equivalent_output(provider):
+    import json
+
+    class Config(SQLiteTestingConfig):
+        JSON_PROVIDER = provider
+
+    app = create_app(Config)
+    payload = {"name": "Pokémon", "types": [{"id": 1}], "mythical_info": None}
+    with app.app_context():
+        body = app.json.response(payload).get_data()
+    assert json.loads(body) == payload
+
+
+def test_sparse_fieldsets_trim_payload_and_queries(app, client):
+    seed_pokemon(4)
+
+    with StatementCounter(db.engine) as counter:
+        data = client.get("/api/v1/pokemon?fields=pokedex_number,name").get_json()
+    assert counter.count == 1
+    assert data[0] == {"name": "Pokemon0", "pokedex_number": 1}
+
+    detail = client.get("/api/v1/pokemon/2?fields=types,mythical_info").get_json()
+    assert detail == {
+        "types": [{"id": 2, "name": "Flying"}, {"id": 3, "name": "Fire"}],
+        "mythical_info": {"classification": "Singular"},
+    }
+
+    random_pick = client.get("/api/v1/pokemon/random?count=2&fields=name").get_json()
+    assert all(list(p) == ["name"] for p in random_pick)
+
+    csv_body = client.get("/api/v1/pokemon/export?format=csv&fields=name,region")
+    assert csv_body.get_data(as_text=True).splitlines()[:2] == ["name,region", "Pokemon0,Kanto"]
+
+    response = client.get("/api/v1/pokemon?fields=name,weight")
+    assert response.status_code == 400
+    assert "weight" in response.get_json()["error"]
+
+
+def test_requests_report_server_timing_and_metrics(app, client, caplog):
+    seed_pokemon(3)
+    app.extensions["metrics"].query_count_threshold = 1
+
+    response = client.get("/api/v1/pokemon?fields=name,types")
+    timing = response.headers["Server-Timing"]
+    assert 'desc="2 queries"' in timing
+    assert "serialize;dur=" in timing and "total;dur=" in timing
+    assert "ran 2 SQL statements" in caplog.text
+
+    body = client.get("/api/v1/metrics").get_data(as_text=True)
+    labels = 'endpoint="/api/v1/pokemon",method="GET"'
+    assert f"pokedex_request_duration_seconds_count{{{labels}}} 1" in body
+    assert f'pokedex_request_queries_bucket{{{labels},le="2"}} 1' in body
+    assert f"pokedex_query_threshold_exceeded_total{{{labels}}} 1" in body
+    assert f'pokedex_requests_total{{{labels},status="200"}} 1' in body
+
+
+def test_api_benchmark_covers_every_route(tmp_path, monkeypatch):
+    from sqlalchemy.engine import Engine
+
+    from benchmarks.api import SKIPPED_ENDPOINTS, _count_statement, route_endpoints, routes, run_benchmark
+
+    monkeypatch.setenv("API_KEY", "test-key")
+    result = run_benchmark(20, 2, 2, tmp_path / "bench.sqlite")
+
+    app = create_app(SQLiteTestingConfig)
+    registered = {
+        (rule.endpoint, method)
+        for rule in app.url_map.iter_rules()
+        for method in rule.methods & {"GET", "POST"}
+    }
+    assert route_endpoints(app, routes(20)) | set(SKIPPED_ENDPOINTS) == registered
+    assert len(result["routes"]) == len(routes(20))
+    assert result["routes"]["GET /pokemon/export"]["queries_per_request"] > 0
+    assert result["concurrent"]["requests"] > 0
+
+    # The statement counter is attached to the benchmark's engine only while it runs.
+    assert not event.contains(Engine, "before_cursor_execute", _count_statement)
+
+
+def test_health_reports_pool_checkout_waits(tmp_path):
+    from app.pool import TimedQueuePool
+
+    class PooledConfig(SQLiteTestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'pool.sqlite'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {"poolclass": TimedQueuePool, "pool_size": 2, "max_overflow": 1}
+
+    app = create_app(PooledConfig)
+    pool = app.test_client().get("/api/v1/health").get_json()["pool"]
+
+    assert pool["class"] == "TimedQueuePool"
+    assert pool["size"] == 2 and pool["max_overflow"] == 1
+    assert pool["checkouts"] >= 1 and pool["timeouts"] == 0
+    assert pool["checked_out"] == 1 and pool["saturation"] == round(1 / 3, 3)
+
+
+def test_get_requests_read_from_replica_until_a_write(tmp_path, api_key):
+    class ReplicaConfig(SQLiteTestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.sqlite'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.sqlite'}"]
+        REPLICA_STICKY_SECONDS = 60
+        CACHE_ENABLED = False
+
+    app = create_app(ReplicaConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(app.extensions["replicas"].engines[0])
+        seed_pokemon(2)
+    replicas = app.extensions["replicas"]
+    replicas._primary_until = 0  # let the seeding write's window lapse
+
+    # The replica has not received the seeded rows yet.
+    assert client.get("/api/v1/pokemon").get_json() == []
+
+    response = client.post(
+        "/api/v1/regions", json={"name": "Hoenn"}, headers={"X-API-Key": "test-key"}
+    )
+    assert response.status_code == 201
+    assert "read_primary_until" in response.headers["Set-Cookie"]
+    assert len(client.get("/api/v1/pokemon").get_json()) == 2
+
+    replicas._primary_until = 0
+    client.delete_cookie("read_primary_until")
+    assert client.get("/api/v1/pokemon").get_json() == []
+
+    # Set-based writes never flush but must open the window too.
+    for path, body in (
+        ("/api/v1/pokemon", [{"name": "Lugia", "pokedex_number": 249, "region_id": 1, "type_ids": [1]}]),
+        ("/api/v1/pokemon/bulk-delete", {"ids": [1]}),
+    ):
+        response = client.post(path, json=body, headers={"X-API-Key": "test-key"})
+        assert response.status_code in (200, 201)
+        assert "read_primary_until" in response.headers["Set-Cookie"]
+        assert replicas._primary_until > 0
+        replicas._primary_until = 0
+        client.delete_cookie("read_primary_until")
+
+
+def test_asgi_mode_serves_reads_natively_and_falls_back_to_flask(tmp_path, api_key):
+    import asyncio
+    import gzip
+    import json
+
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("asgiref")
+    from app.asgi import create_asgi_app
+
+    class FileConfig(SQLiteTestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'asgi.sqlite'}"
+
+    flask_app = create_app(FileConfig)
+    with flask_app.app_context():
+        db.create_all()
+        seed_pokemon(3)
+    asgi_app = create_asgi_app(flask_app)
+
+    def call(method, path, body=b"", headers=()):
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http", "http_version": "1.1", "method": method, "scheme": "http",
+            "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+            "root_path": "", "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+            "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        async def run():
+            await asgi_app(scope, receive, send)
+            await asgi_app.engine.dispose()
+
+        asyncio.run(run())
+        response_headers = dict(messages[0]["headers"])
+        return messages[0]["status"], response_headers, b"".join(m.get("body", b"") for m in messages[1:])
+
+    flask_client = flask_app.test_client()
+    for path in (
+        "/api/v1/pokemon?per_page=2&cursor=",
+        "/api/v1/pokemon/2?fields=name,types",
+        "/api/v1/pokemon/name/pokémon1",
+    ):
+        status, headers, body = call("GET", path)
+        assert status == 200
+        assert b"server-timing" not in headers  # answered by the async path
+        assert json.loads(body) == flask_client.get(path).get_json()
+
+    origin = [("Origin", "https://frontend.test")]
+    status, headers, _ = call("GET", "/api/v1/pokemon", headers=origin)
+    expected = flask_client.get("/api/v1/pokemon", headers=dict(origin)).headers
+    assert headers[b"access-control-allow-origin"] == b"https://frontend.test"
+    assert headers[b"access-control-allow-origin"].decode() == expected["Access-Control-Allow-Origin"]
+    assert headers[b"vary"].decode() == expected["Vary"]
+
+    status, headers, _ = call("GET", "/api/v1/pokemon/name/Pokemon1")
+    assert headers[b"access-control-allow-origin"] == b"*"
+    etag = headers[b"etag"].decode()
+    assert call("GET", "/api/v1/pokemon/name/Pokemon1", headers=[("If-None-Match", etag)])[0] == 304
+
+    status, headers, body = call("GET", "/api/v1/pokemon", headers=[("Accept-Encoding", "gzip")])
+    assert headers[b"content-encoding"] == b"gzip" and headers[b"etag"].endswith(b'-gzip"')
+    assert json.loads(gzip.decompress(body)) == flask_client.get("/api/v1/pokemon").get_json()
+
+    assert call("GET", "/api/v1/pokemon/99")[0] == 404
+    status, headers, _ = call(
+        "POST", "/api/v1/regions", body=b'{"name": "Hoenn"}',
+        headers=[("Content-Type", "application/json"), ("Content-Length", "17"), ("X-API-Key", "test-key")],
+    )
+    assert status == 201 and b"server-timing" in headers  # handled by Flask
+
+
+def test_batch_lookup_resolves_keys_in_request_order_with_one_query(app, client):
+    seed_pokemon(6)
+
+    with StatementCounter(db.engine) as counter:
+        data = client.get(
+            "/api/v1/pokemon/batch?dex=3,99&name=Pokemon0&dex=3&fields=name"
+        ).get_json()
+    assert counter.count == 1
+    assert data == [
+        {"dex": 3, "pokemon": {"name": "Pokemon2"}},
+        {"dex": 99, "pokemon": None},
+        {"name": "Pokemon0", "pokemon": {"name": "Pokemon0"}},
+        {"dex": 3, "pokemon": {"name": "Pokemon2"}},
+    ]
+
+    full = client.get("/api/v1/pokemon/batch?name=Pokemon1").get_json()
+    assert full[0]["pokemon"]["types"] == [{"id": 2, "name": "Flying"}, {"id": 3, "name": "Fire"}]
+
+    app.config["BATCH_MAX_KEYS"] = 2
+    assert client.get("/api/v1/pokemon/batch?dex=1,2,3").status_code == 400
+    assert client.get("/api/v1/pokemon/batch?dex=abc").status_code == 400
+    assert client.get("/api/v1/pokemon/batch").status_code == 400
+
+
+def test_change_feed_returns_upserts_and_deletes_since_token(app, client, api_key):
+    app.config["CHANGES_SETTLE_SECONDS"] = 0
+    seed_pokemon(3)
+
+    first = client.get("/api/v1/pokemon/changes?limit=2&fields=name").get_json()
+    assert first["upserts"] == [{"name": "Pokemon0"}, {"name": "Pokemon1"}]
+    assert first["has_more"] is True
+    second = client.get(f"/api/v1/pokemon/changes?since={first['next_token']}").get_json()
+    assert [p["name"] for p in second["upserts"]] == ["Pokemon2"]
+    assert second["deletes"] == [] and second["has_more"] is False
+
+    token = second["next_token"]
+    idle = client.get(f"/api/v1/pokemon/changes?since={token}").get_json()
+    assert idle["upserts"] == [] and idle["next_token"] == token
+
+    pokemon_id = Pokemon.query.filter_by(pokedex_number=2).one().id
+    client.delete(f"/api/v1/pokemon/{pokemon_id}", headers=api_key)
+    client.post(
+        "/api/v1/pokemon",
+        json={"name": "Newcomer", "pokedex_number": 10, "region_id": 1, "type_ids": [1]},
+        headers=api_key,
+    )
+    changes = client.get(f"/api/v1/pokemon/changes?since={token}").get_json()
+    assert [p["name"] for p in changes["upserts"]] == ["Newcomer"]
+    assert [(d["id"], d["pokedex_number"]) for d in changes["deletes"]] == [(pokemon_id, 2)]
+
+    app.config["CHANGES_SETTLE_SECONDS"] = 60
+    unsettled = client.get(f"/api/v1/pokemon/changes?since={token}")
+    assert unsettled.get_json()["upserts"] == []
+    assert unsettled.headers["Cache-Control"] == "no-store"
+    assert client.get("/api/v1/pokemon/changes?since=garbage").status_code == 400
+
+
+def test_seed_replaces_data_deterministically(app, client, api_key):
+    from app.models import PokemonTombstone
+
+    response = client.post("/api/v1/seed", json={"synthetic": 40, "random_seed": 7}, headers=api_key)
+    assert response.status_code == 201
+    rows = response.get_json()["rows"]
+    assert rows["pokemon"] == 26 + 40 and rows["type"] == 18
+    names = [p["name"] for p in client.get("/api/v1/pokemon?per_page=100").get_json()]
+    assert "Mewtwo" in names and len(names) == 66
+    legendary = client.get("/api/v1/pokemon/legendary?per_page=100").get_json()
+    assert {p["mythical_info"]["classification"] for p in legendary} == {"Legendary"}
+
+    result = app.test_cli_runner().invoke(args=["seed", "--synthetic", "40", "--random-seed", "7"])
+    assert result.exit_code == 0, result.output
+    db.session.expire_all()
+    assert [p["name"] for p in client.get("/api/v1/pokemon?per_page=100").get_json()] == names
+    assert PokemonTombstone.query.count() == 66
+    assert min(p.id for p in Pokemon.query) > max(t.pokemon_id for t in PokemonTombstone.query)
+
+    assert client.post("/api/v1/seed", json={"synthetic": -1}, headers=api_key).status_code == 400
+    assert client.post("/api/v1/seed").status_code == 401
+
+
+def test_bulk_delete_uses_set_based_statements(app, client, api_key):
+    from app.models import PokemonTombstone
+
+    seed_pokemon(6)  # Pokémon i has types i%3 and (i+1)%3, region i%2
+    with StatementCounter(db.engine) as counter:
+        response = client.post(
+            "/api/v1/pokemon/bulk-delete",
+            json={"filter": {"type": "Psychic", "region": "Kanto"}},
+            headers=api_key,
+        )
+    assert response.status_code == 200
+    # id lookup, facts, tombstones, one DELETE per table, then the summary:
+    # decrement and the region dex range refresh
+    assert counter.count == 8
+    assert response.get_json()["deleted"] == {"mythical_pokemon": 2, "pokemon_type": 4, "pokemon": 2}
+    assert PokemonTombstone.query.count() == 2
+
+    response = client.post(
+        "/api/v1/pokemon/bulk-delete", json={"pokedex_numbers": [2, 99], "ids": [2, 3]}, headers=api_key
+    )
+    assert response.get_json()["deleted"]["pokemon"] == 1
+    assert sorted(p["pokedex_number"] for p in client.get("/api/v1/pokemon").get_json()) == [4, 5, 6]
+
+    for body in ({}, {"ids": "1"}, {"filter": {}}, {"filter": {"color": "red"}}):
+        assert client.post("/api/v1/pokemon/bulk-delete", json=body, headers=api_key).status_code == 400
+    assert client.post("/api/v1/pokemon/bulk-delete", json={"ids": [1]}).status_code == 401
+
+
+def test_rate_limit_buckets_per_client_and_concurrency_caps(api_key):
+    class LimitedConfig(SQLiteTestingConfig):
+        RATELIMIT_ENABLED = True
+        RATELIMIT_DEFAULT = (1, 2)
+        CONCURRENCY_LIMITS = {"export": 1}
+
+    app = create_app(LimitedConfig)
+    with app.app_context():
+        db.create_all()
+        seed_pokemon(3)
+        client = app.test_client()
+
+        assert [client.get("/api/v1/types").status_code for _ in range(3)] == [200, 200, 429]
+        limited = client.get("/api/v1/types")
+        assert limited.status_code == 429 and int(limited.headers["Retry-After"]) >= 1
+        # Other clients, and the same client on another blueprint, have their own buckets.
+        assert client.get("/api/v1/types", environ_base={"REMOTE_ADDR": "10.0.0.2"}).status_code == 200
+        assert client.get("/api/v1/types", headers=api_key).status_code == 200
+        assert client.get("/api/v1/regions").status_code == 200
+        assert all(client.get("/api/v1/health").status_code == 200 for _ in range(5))
+
+        app.extensions["ratelimit"].default_limit = None
+        streaming = client.get("/api/v1/pokemon/export", buffered=False)
+        assert client.get("/api/v1/pokemon/export").status_code == 429
+        streaming.close()
+        assert client.get("/api/v1/pokemon/export").status_code == 200
+        assert client.get("/api/v1/health").get_json()["rate_limit"]["rate_limited"] == 2
+        db.session.remove()
+        db.drop_all()
+
+
+def test_rate_limit_keys_on_forwarded_client_ip_behind_trusted_proxies():
+    class ProxiedConfig(SQLiteTestingConfig):
+        RATELIMIT_ENABLED = True
+        RATELIMIT_DEFAULT = (1, 1)
+        TRUSTED_PROXY_COUNT = 1
+
+    app = create_app(ProxiedConfig)
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+
+        def get(forwarded_for):
+            return client.get(
+                "/api/v1/types",
+                headers={"X-Forwarded-For": forwarded_for},
+                environ_base={"REMOTE_ADDR": "10.0.0.1"},  # the proxy
+            ).status_code
+
+        # Only the entry the trusted proxy appended counts; a client-supplied one is ignored.
+        assert [get("203.0.113.1"), get("198.51.100.7, 203.0.113.1")] == [200, 429]
+        assert get("203.0.113.2") == 200
+        db.session.remove()
+        db.drop_all()
+
+    pytest.importorskip("asgiref")
+    from app.asgi import AsyncRequest
+
+    scope = {
+        "path": "/", "query_string": b"", "client": ("10.0.0.1", 1234),
+        "headers": [(b"x-forwarded-for", b"198.51.100.7, 203.0.113.1")],
+    }
+    assert AsyncRequest(scope).remote_addr == "10.0.0.1"
+    assert AsyncRequest(scope, trusted_proxies=1).remote_addr == "203.0.113.1"
+    assert AsyncRequest(scope, trusted_proxies=3).remote_addr == "10.0.0.1"
+
+
+def test_file_bucket_store_evicts_refilled_and_excess_buckets(tmp_path):
+    import os
+
+    from app.ratelimit import FileBucketStore
+
+    store = FileBucketStore({"RATELIMIT_DIR": str(tmp_path), "RATELIMIT_MAX_KEYS": 3})
+    for i in range(5):
+        store.take(f"ip:10.0.0.{i}", rate=1, burst=10, now=1000.0 + i)
+    assert len(os.listdir(tmp_path)) == 5  # swept at most every SWEEP_INTERVAL
+
+    for name in os.listdir(tmp_path)[:2]:
+        os.utime(tmp_path / name, (0, 0))  # idle long enough to have refilled
+    store.sweep(now=store._next_sweep)
+    assert len(os.listdir(tmp_path)) == 3
+
+    store.take("ip:10.0.0.9", rate=1, burst=10, now=store._next_sweep)
+    assert len(os.listdir(tmp_path)) == 3  # capped at RATELIMIT_MAX_KEYS
+
+
+def test_gzip_bodies_are_cached_per_etag(app, client):
+    import gzip
+    import json
+
+    seed_pokemon(20)
+    gzip_header = {"Accept-Encoding": "gzip"}
+    first = client.get("/api/v1/pokemon", headers=gzip_header)
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["Vary"]
+    assert json.loads(gzip.decompress(first.data)) == client.get("/api/v1/pokemon").get_json()
+    etag = first.headers["ETag"]
+    assert etag.endswith('-gzip"') and client.get("/api/v1/pokemon").headers["ETag"] != etag
+
+    # Repeat requests skip the view, serialization and compression.
+    with StatementCounter(db.engine) as counter:
+        repeat = client.get("/api/v1/pokemon", headers=gzip_header)
+    assert counter.count == 0
+    assert repeat.data == first.data and repeat.headers["ETag"] == etag
+    assert client.get("/api/v1/pokemon", headers={**gzip_header, "If-None-Match": etag}).status_code == 304
+
+    small = client.get("/api/v1/regions", headers=gzip_header)
+    assert "Content-Encoding" not in small.headers
+    refused = client.get("/api/v1/pokemon", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_stats_are_maintained_incrementally(app, client, api_key):
+    seed_pokemon(6)  # Kanto: 1, 3, 5; Johto: 2, 4, 6
+    stats = client.get("/api/v1/stats").get_json()
+    assert stats["total"] == 6
+    kanto = stats["by_region"][0]
+    assert (kanto["name"], kanto["count"], kanto["min_dex"], kanto["max_dex"]) == ("Kanto", 3, 1, 5)
+    assert kanto["coverage"] == 0.6
+    assert {t["name"]: t["count"] for t in stats["by_type"]} == {"Psychic": 4, "Flying": 4, "Fire": 4}
+    pairs = {tuple(t["name"] for t in p["types"]): p["count"] for p in stats["type_pairs"]}
+    assert pairs == {("Psychic", "Flying"): 2, ("Flying", "Fire"): 2, ("Psychic", "Fire"): 2}
+
+    def rebuilt():
+        rebuild_stats()
+        db.session.commit()
+        return load_stats()
+
+    threshold = app.config["QUERY_COUNT_THRESHOLD"]
+    with StatementCounter(db.engine) as counter:
+        client.post(
+            "/api/v1/pokemon",
+            json={"name": "Lugia", "pokedex_number": 249, "region_id": 1, "type_ids": [2, 1]},
+            headers=api_key,
+        )
+    assert counter.count <= threshold  # routine writes stay under the N+1 warning
+    client.post(
+        "/api/v1/pokemon",
+        json=[{"name": "Ho-Oh", "pokedex_number": 250, "region_id": 2, "type_ids": [3],
+               "mythical": {"classification_id": 2}}],
+        headers=api_key,
+    )
+    with StatementCounter(db.engine) as counter:
+        client.delete("/api/v1/pokemon/5", headers=api_key)  # Kanto's #5
+    assert counter.count <= threshold
+    client.post("/api/v1/pokemon/bulk-delete", json={"ids": [2]}, headers=api_key)
+
+    stats = client.get("/api/v1/stats").get_json()
+    assert stats == rebuilt()
+    assert stats["total"] == 6
+    assert stats["by_region"][0]["max_dex"] == 249
+    assert {c["name"]: c["count"] for c in stats["by_classification"]} == {
+        "Legendary": 2, "Singular": 3, None: 1
+    }
+
+    client.get("/api/v1/stats")
+    with StatementCounter(db.engine) as counter:
+        client.get("/api/v1/stats")
+    assert counter.count == 0  # served from the cache until the summary changes
+
+    db.session.execute(db.delete(db.metadata.tables["pokemon_stat"]))
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=["stats", "rebuild"])
+    assert result.exit_code == 0, result.output
+    assert client.get("/api/v1/stats").get_json() == stats
+
+
+def test_stats_generic_upsert_refills_an_emptied_region(app, client, api_key, monkeypatch):
+    from app.stats import PokemonFacts, record_created
+
+    seed_pokemon(6)  # Kanto: 1, 3, 5
+    client.post("/api/v1/pokemon/bulk-delete", json={"ids": [1, 3, 5]}, headers=api_key)
+
+    with monkeypatch.context() as patch:
+        # Take the per-row fallback used by dialects without an upsert statement.
+        patch.setattr(db.engine.dialect, "name", "postgresql")
+        record_created([PokemonFacts(7, 1, (1,), None)])
+    db.session.commit()
+
+    kanto = load_stats()["by_region"][0]
+    assert (kanto["count"], kanto["min_dex"], kanto["max_dex"]) == (1, 7, 7)